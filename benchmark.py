@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+import operator
+import random
+import time
+import types
+from optparse import OptionParser
+
+import giveaway_bot
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+STEAMGIFTS_ROW = '''
+<div class="giveaway__row-outer-wrap" data-game-id="%(game_id)s">
+  <div class="giveaway__row-inner-wrap">
+    <div class="giveaway__summary">
+      <h2 class="giveaway__heading">
+        <a class="giveaway__heading__name" href="/giveaway/%(code)s/game-%(num)s">Game %(num)s</a>
+        <span class="giveaway__heading__thin">(%(points)sP)</span>
+        <a class="giveaway__icon" rel="nofollow" target="_blank" href="http://store.steampowered.com/app/%(game_id)s/"><i class="fa fa-steam"></i></a>
+        <i class="giveaway__icon giveaway__hide trigger-popup fa fa-eye-slash" title="Hide all giveaways for this game"></i>
+      </h2>
+      <div class="giveaway__columns">
+        <div><i class="fa fa-clock-o"></i> <span data-timestamp="1500000000">2 hours</span> remaining</div>
+        <div class="giveaway__column--width-fill text-right"><span data-timestamp="1490000000">1 day</span> ago by <a class="giveaway__username" href="/user/user%(num)s">user%(num)s</a></div>
+        <div class="giveaway__column--contributor-level giveaway__column--contributor-level--positive" title="Contributor Level">Level %(level)s+</div>
+      </div>
+      <div class="giveaway__links">
+        <a href="/giveaway/%(code)s/game-%(num)s/entries"><i class="fa fa-tag"></i> <span>1,234 entries</span></a>
+        <a href="/giveaway/%(code)s/game-%(num)s/comments"><i class="fa fa-comment"></i> <span>12 comments</span></a>
+      </div>
+    </div>
+    <a class="giveaway_image_avatar" href="/user/user%(num)s"><div style="background-image:url(https://example.com/avatar.jpg);"></div></a>
+    <a class="giveaway_image_thumbnail" href="/giveaway/%(code)s/game-%(num)s"></a>
+  </div>
+</div>
+'''
+
+INDIEGALA_ROW = '''
+<div class="col-xs-6 col-sm-4 col-md-4 tickets-col">
+  <div class="ticket-cont">
+    <div class="ticket-left">
+      <div class="box_pad_5"><h2><a title="Game %(num)s" href="/giveaways/detail/%(code)s">Game %(num)s</a></h2></div>
+      <div class="type-level-cont"><span>Level %(level)s</span> not guaranteed</div>
+      <div class="steamnick"><a href="/profile/user%(num)s">user%(num)s</a></div>
+    </div>
+    <div class="ticket-right"><div class="relative" rel="%(code)s"><img src="https://example.com/%(game_id)s.jpg"></div></div>
+    <div class="ticket-price"><strong>%(points)s</strong> coins</div>
+    <aside class="giv-coupon"><a class="giv-coupon-link" href="#">Join</a></aside>
+  </div>
+</div>
+'''
+
+# Navigation, sidebar and scripts around listing, rows usually is small part of page
+FILLER = '<div class="sidebar__navigation">%s</div><script>var data = "%s";</script>' % (
+    '<a class="sidebar__navigation__item" href="/giveaways/search?type=wishlist"><span>Item</span></a>' * 50,
+    'x' * 20000)
+
+
+def synthetic_pages(rows):
+    values = [{'num': num, 'code': 'code%s' % num, 'game_id': 10 + num, 'points': 1 + num % 50, 'level': num % 10}
+              for num in range(rows)]
+
+    steamgifts = '<html><body><header>%s</header><div class="page__heading"></div><div>%s</div>%s</body></html>' % (
+        FILLER, ''.join(STEAMGIFTS_ROW % v for v in values), FILLER)
+    indiegala = '<html><body><header>%s</header><div class="tickets-row">%s</div>%s</body></html>' % (
+        FILLER, ''.join(INDIEGALA_ROW % v for v in values), FILLER)
+
+    return steamgifts.encode(), indiegala.encode()
+
+
+def soup_parser(harvester, strainer):
+    def parse(html):
+        return harvester._parse_rows_soup(giveaway_bot.bs4.BeautifulSoup(html, giveaway_bot.PARSER, parse_only=strainer))
+
+    return parse
+
+
+def measure(fn, html, repeat):
+    rows = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rows += len(fn(html))
+    spent = time.perf_counter() - start
+
+    return rows / spent
+
+
+class GiveawayBatch:
+    converters = {'points': int, 'level': int, 'entered': bool}
+
+    def __init__(self, giveaways, use_numpy):
+        """
+        Column oriented view of giveaways page, check many filters in one pass
+        :param giveaways: list of giveaways
+        :param use_numpy: check with numpy masks
+        """
+        self.giveaways = list(giveaways)
+        self.use_numpy = use_numpy
+        self.columns = {}
+
+    def column(self, name):
+        """
+        :param name: giveaway field from converters
+        :return: field values, not convertible values are None or NaN
+        """
+        try:
+            return self.columns[name]
+        except KeyError:
+            pass
+
+        convert = self.converters[name]
+        get = operator.attrgetter(name)
+        try:
+            if self.use_numpy:
+                # Numbers converted by numpy itself, it's much faster
+                fields = map(get, self.giveaways)
+                if convert is not int:
+                    fields = map(convert, fields)
+                values = numpy.fromiter(fields, dtype=float, count=len(self.giveaways))
+            else:
+                values = [convert(get(g)) for g in self.giveaways]
+        except (AttributeError, TypeError, ValueError):
+            # Some giveaways have broken field, they will not match any predicate on it
+            values = []
+            for g in self.giveaways:
+                try:
+                    values.append(convert(get(g)))
+                except (AttributeError, TypeError, ValueError):
+                    values.append(None)
+
+            if self.use_numpy:
+                values = numpy.array([numpy.nan if v is None else v for v in values], dtype=float)
+
+        self.columns[name] = values
+
+        return values
+
+    def select(self, predicates):
+        """
+        :param predicates: list of (column name, operator, value)
+        :return: giveaways match all predicates
+        """
+        if self.use_numpy:
+            mask = numpy.ones(len(self.giveaways), dtype=bool)
+            for name, op, value in predicates:
+                mask &= op(self.column(name), value)
+
+            return [self.giveaways[i] for i in numpy.flatnonzero(mask).tolist()]
+
+        masks = [[v is not None and op(v, value) for v in self.column(name)] for name, op, value in predicates]
+        return [g for g, keep in zip(self.giveaways, map(all, zip(*masks))) if keep]
+
+
+def synthetic_giveaways(rows):
+    giveaway = type('BenchGiveaway', (giveaway_bot.Giveaway, ), {'__slots__': (), 'enter': lambda self: 'ok'})
+    rnd = random.Random(rows)
+
+    return [giveaway(None, 'Game %s' % num, '', rnd.random() < 0.2, rnd.randrange(10), rnd.randrange(1, 100), '')
+            for num in range(rows)]
+
+
+def measure_filters(giveaways, repeat):
+    """
+    Local filters of harvester with level 5 and max_points=50, min_points=3, min_level=1
+    :return: {backend: rows/sec}
+    """
+    harvester = types.SimpleNamespace(level=5)
+    arged = [('max_points', 50), ('min_points', 3), ('min_level', 1)]
+
+    def per_filter(giveaways):
+        giveaways = giveaway_bot.Harvester._filter_entered(harvester, giveaways)
+        giveaways = giveaway_bot.Harvester._filter_level(harvester, giveaways)
+        for name, arg in arged:
+            giveaways = getattr(giveaway_bot.Harvester, '_arged_filter_%s' % name)(harvester, giveaways, arg)
+        return giveaways
+
+    # Same filters as column predicates
+    predicates = [('entered', operator.eq, False), ('level', operator.le, harvester.level),
+                  ('points', operator.le, 50), ('points', operator.ge, 3), ('level', operator.ge, 1)]
+
+    backends = [('per filter lists', per_filter),
+                ('batch, python', lambda g: GiveawayBatch(g, use_numpy=False).select(predicates))]
+    if numpy is not None:
+        backends.append(('batch, numpy', lambda g: GiveawayBatch(g, use_numpy=True).select(predicates)))
+
+    expected = per_filter(giveaways)
+    results = {}
+    for backend, fn in backends:
+        assert fn(giveaways) == expected
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(giveaways)
+        results[backend] = len(giveaways) * repeat / (time.perf_counter() - start)
+
+    return results
+
+
+def main():
+    opt_parser = OptionParser()
+    opt_parser.add_option("--steamgifts", dest="steamgifts", help="Saved SteamGifts giveaways page")
+    opt_parser.add_option("--indiegala", dest="indiegala", help="Saved IndieGala giveaways page")
+    opt_parser.add_option("--rows", dest="rows", type="int", default=50, help="Rows on synthetic pages")
+    opt_parser.add_option("--repeat", dest="repeat", type="int", default=20, help="Parse each page times")
+    opt_parser.add_option("--filter-rows", dest="filter_rows", type="int", default=10000,
+                          help="Giveaways in synthetic page for local filters")
+    options, args = opt_parser.parse_args()
+
+    steamgifts, indiegala = synthetic_pages(options.rows)
+    if options.steamgifts:
+        with open(options.steamgifts, 'rb') as page:
+            steamgifts = page.read()
+    if options.indiegala:
+        with open(options.indiegala, 'rb') as page:
+            indiegala = page.read()
+
+    for harvester, html in ((giveaway_bot.SteamGiftsHarvester, steamgifts),
+                            (giveaway_bot.IndieGalaHarvester, indiegala)):
+        backends = [('soup, whole page', soup_parser(harvester, None)),
+                    ('soup, rows only', soup_parser(harvester, harvester.rows_strainer))]
+        if giveaway_bot.PARSER == "lxml":
+            backends.append(('lxml xpath',
+                             lambda h: harvester._parse_rows_lxml(giveaway_bot.lxml.html.document_fromstring(h))))
+
+        print("%s, %s KB page:" % (harvester.name, len(html) // 1024))
+        for backend, fn in backends:
+            print("    %-18s %10.0f rows/sec" % (backend, measure(fn, html, options.repeat)))
+
+    print("Local filters, %s giveaways:" % options.filter_rows)
+    for backend, speed in measure_filters(synthetic_giveaways(options.filter_rows), options.repeat).items():
+        print("    %-18s %10.0f rows/sec" % (backend, speed))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,32 @@
 #!/usr/bin/env python3
 
 import abc
+import asyncio
+import codecs
+import collections
+import collections.abc
+import concurrent.futures
 import configparser
+import email.utils
+import functools
+import itertools
 import os
 import json
 import logging
 import multiprocessing
+import multiprocessing.connection
+import random
 import os
 import re
+import sqlite3
 import sys
+import threading
 import time
+import types
+import urllib.parse
 from datetime import datetime, timedelta
 from optparse import OptionParser
+from queue import Full, Queue
 from http import cookiejar
 from requests.exceptions import TooManyRedirects
 
@@ -19,7 +34,7 @@ import bs4
 import requests
 
 try:
-    import lxml
+    import lxml.html
 except ImportError:
     PARSER = "html.parser"
 else:
@@ -30,6 +45,8 @@ os.chdir(os.path.dirname(__file__))
 USER_AGENT = 'Mozilla/5.0 (Windows NT 6.1; WOW64; rv:50) Gecko/20100101 Firefox/50.0'
 UNIT_TESTS = False
 TRAVIS_BUILD = False
+# Process runs only one parser, set by worker_spawner and steam_spawner
+DEDICATED_WORKER = False
 
 class Error(Exception):
     pass
@@ -46,6 +63,25 @@ class NoItemsError(Exception):
 class ReapError(Exception):
     pass
 
+class ConfigError(Exception):
+    pass
+
+class RateLimitError(Exception):
+    def __init__(self, url, retry_after=None):
+        """
+        Site answered 429 or 503
+        :param retry_after: seconds to wait from Retry-After header, None if not set
+        """
+        super(RateLimitError, self).__init__(url)
+        self.retry_after = retry_after
+
+
+def xpath_class(name):
+    """
+    :return: xpath condition for element with class name, like in css selector
+    """
+    return "contains(concat(' ', normalize-space(@class), ' '), ' %s ')" % name
+
 
 def caching_property(prop):
     def wrapped(self):
@@ -61,65 +97,385 @@ def caching_property(prop):
     return wrapped
 
 
+# Filters cost classes: only giveaway fields, data fetched once per harvest, request per giveaway
+COST_LOCAL = 0
+COST_CACHED = 1
+COST_NETWORK = 2
+
+
+def filter_cost(cost):
+    """
+    Declare filter cost class, filters with lower cost applied first
+    :param cost: COST_LOCAL, COST_CACHED or COST_NETWORK
+    """
+    def decorator(fn):
+        fn.cost = cost
+        return fn
+
+    return decorator
+
+
+class RetryPolicy:
+    def __init__(self, retries=0, delay=0, backoff=2, max_delay=60, jitter=0.5, max_time=0):
+        """
+        Exponential backoff between retries
+        :param retries: max retries count
+        :param delay: seconds before first retry
+        :param backoff: delay multiplier for each next retry
+        :param max_delay: max seconds before retry, longer Retry-After of site stops retries
+        :param jitter: part of delay randomly cut off, so processes don't retry all at once
+        :param max_time: max seconds of all retries, 0 - unlimited
+        """
+        self.retries = retries
+        self.delay = delay
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.max_time = max_time
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        :param config: site config section
+        """
+        options = {}
+        for option, key, convert in (('retries', 'retry', int), ('delay', 'timeout', float),
+                                     ('backoff', 'retry_backoff', float), ('max_delay', 'retry_max_delay', float),
+                                     ('jitter', 'retry_jitter', float), ('max_time', 'retry_max_time', float)):
+            try:
+                options[option] = convert(config[key])
+            except KeyError:
+                pass
+
+        return cls(**options)
+
+    def get_delay(self, attempt, retry_after=None):
+        """
+        :param attempt: number of failed attempt, from 0
+        :param retry_after: seconds asked by site
+        :return: seconds to wait before next attempt
+        """
+        if retry_after is not None:
+            return retry_after
+
+        delay = min(self.delay * self.backoff ** attempt, self.max_delay)
+        return delay * (1 - self.jitter * random.random())
+
+    def wait(self, attempt, started, retry_after=None):
+        """
+        Sleep before next attempt, if it allowed
+        :param attempt: number of failed attempt, from 0
+        :param started: time.monotonic() of first attempt
+        :param retry_after: seconds asked by site
+        :return: False if no more retries
+        """
+        if attempt >= self.retries:
+            return False
+
+        # Site asks to come back later than we are ready to wait, don't sleep through harvest
+        if retry_after is not None and retry_after > self.max_delay:
+            return False
+
+        delay = self.get_delay(attempt, retry_after)
+        if self.max_time and time.monotonic() - started + delay > self.max_time:
+            return False
+
+        if delay > 0:
+            time.sleep(delay)
+
+        return True
+
+
+def parse_retry_after(value):
+    """
+    :param value: Retry-After header, seconds or http date
+    :return: seconds to wait, None if not set or broken
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def rate_limit_hook(response, *args, **kwargs):
+    """
+    Session response hook, turn «slow down» answers into RateLimitError
+    """
+    if response.status_code in (429, 503):
+        raise RateLimitError(response.url, parse_retry_after(response.headers.get('Retry-After')))
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=1):
+        """
+        Allow rate requests per second on average and burst requests at once
+        :param rate: requests per second
+        :param burst: max saved tokens
+        """
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take token, wait if bucket is empty
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+
+            time.sleep(delay)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(url):
+    """
+    Token bucket of url host configured in «RateLimit» section, shared by all sessions of process
+    :param url: requested url
+    :return: TokenBucket or None if host is not limited
+    """
+    host = urllib.parse.urlsplit(url).hostname
+    config = get_config().get('RateLimit', {})
+    try:
+        rate = float(config.get(host, config.get('default', 0)))
+        burst = int(config.get('burst', 1))
+    except ValueError:
+        return None
+
+    if rate <= 0:
+        return None
+
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None or (bucket.rate, bucket.burst) != (rate, max(burst, 1)):
+            bucket = TokenBucket(rate, burst)
+            _buckets[host] = bucket
+
+    return bucket
+
+
+class RateLimitedSession(requests.Session):
+    """
+    Session what wait for host token bucket before each request
+    """
+    def request(self, method, url, *args, **kwargs):
+        bucket = get_bucket(url)
+        if bucket:
+            bucket.acquire()
+
+        return super(RateLimitedSession, self).request(method, url, *args, **kwargs)
+
+
 def retrying(fn):
     def wrapped(*args, **kwargs):
         obj = args[0]
-        try:
-            retries = int(obj.config['retry'])
-        except KeyError:
-            retries = 0
+        policy = RetryPolicy.from_config(obj.config)
 
-        try:
-            timeout = int(obj.config['timeout'])
-        except KeyError:
-            timeout = 0
-
-        retry = 0
+        attempt = 0
+        started = time.monotonic()
         while True:
             try:
                 return fn(*args, **kwargs)
+            except RateLimitError as e:
+                if not policy.wait(attempt, started, e.retry_after):
+                    obj._crash("%s asks to slow down. Interrupt parsing." % obj.verbose_name)
+
             except AuthError:
-                if retry < retries:
-                    retry += 1
-                    continue
-                else:
+                if not policy.wait(attempt, started):
                     obj._crash("Can't login to %s. Check cookies." % obj.verbose_name)
 
             except ParseError:
-                if retry < retries:
-                    retry += 1
-                    continue
-                else:
+                if not policy.wait(attempt, started):
                     obj._crash("%s parsing error. Interrupt parsing." % obj.verbose_name)
 
             except NoItemsError:
-                if retry < retries:
-                    retry += 1
-                    continue
-                else:
+                if not policy.wait(attempt, started):
                     return []
 
             except ReapError:
-                if retry < retries:
-                    retry += 1
-                    continue
-                else:
+                if not policy.wait(attempt, started):
                     obj._crash("%s reap error. Interrupt reaping." % obj.verbose_name)
 
             except TooManyRedirects:
                 obj._crash("Can't login to %s. Check cookies." % obj.verbose_name)
 
             except:
-                if retry < retries:
-                    retry += 1
-                    continue
-                else:
+                if not policy.wait(attempt, started):
                     raise
 
-            time.sleep(timeout)
+            attempt += 1
 
     return wrapped
 
+
+def stop_after_crash(fn):
+    """
+    Raise error of previous crash of parser instead of new requests, until parser is reset
+    """
+    def wrapped(*args, **kwargs):
+        obj = args[0]
+        if obj.failure is not None:
+            raise Error(obj.failure)
+
+        return fn(*args, **kwargs)
+
+    return wrapped
+
+class ConfigSection(collections.abc.Mapping):
+    """
+    Read only config section, option names case insensitive like in configparser
+    """
+    def __init__(self, options):
+        self._options = {key.lower(): value for key, value in options.items()}
+
+    def __getitem__(self, key):
+        return self._options[key.lower()]
+
+    def __iter__(self):
+        return iter(self._options)
+
+    def __len__(self):
+        return len(self._options)
+
+    def __repr__(self):
+        return 'ConfigSection(%r)' % self._options
+
+
+_config = {'path': None, 'mtime': None, 'snapshot': None}
+
+
+def load_config():
+    """
+    Read and validate config file, if it changed since last read
+    :return: read only mapping of section names and ConfigSection
+    """
+    if TRAVIS_BUILD:
+        path = "giveaway_bot.exp"
+    else:
+        path = "giveaway_bot.ini"
+
+    mtime = os.stat(path).st_mtime
+    if _config['path'] == path and _config['mtime'] == mtime:
+        return _config['snapshot']
+
+    config = configparser.ConfigParser()
+    with open(path) as config_file:
+        try:
+            config.read_file(config_file)
+        except configparser.Error as e:
+            raise ConfigError("Can't parse config file: %s" % e)
+
+    for section, options in (('main', ('sleepTime', )),
+                             ('Steam', ('retry', 'timeout')),
+                             ('SteamGifts', ('enable', 'retry', 'timeout')),
+                             ('IndieGala', ('enable', 'retry', 'timeout'))):
+        if section not in config:
+            raise ConfigError("No «%s» section in config file." % section)
+
+        for option in options:
+            try:
+                int(config[section][option])
+            except KeyError:
+                raise ConfigError("No «%s» option in «%s» section." % (option, section))
+            except ValueError:
+                raise ConfigError("«%s» option in «%s» section must be number." % (option, section))
+
+    if executor_name(config['main']) not in EXECUTORS:
+        raise ConfigError("«executor» option in «main» section must be one of «%s»." % "», «".join(EXECUTORS))
+
+    for option in ('workers', 'harvest_timeout'):
+        try:
+            int(config['main'].get(option, 0))
+        except ValueError:
+            raise ConfigError("«%s» option in «main» section must be number." % option)
+
+    snapshot = {section: ConfigSection(config[section]) for section in config.sections()}
+    set_config(snapshot)
+    _config.update({'path': path, 'mtime': mtime})
+
+    return _config['snapshot']
+
+
+def get_config():
+    """
+    :return: current config snapshot, file read only if it not loaded yet
+    """
+    if _config['snapshot'] is None:
+        return load_config()
+
+    return _config['snapshot']
+
+
+def set_config(snapshot):
+    """
+    Use config loaded in other process
+    :param snapshot: mapping of section names and ConfigSection
+    """
+    _config['snapshot'] = types.MappingProxyType(dict(snapshot))
+
+
+class Channel:
+    """
+    Write end of pipe with put like queue, so main process can wait on read ends of all harvesters at once
+    """
+    def __init__(self, connection):
+        self.connection = connection
+        # Harvester threads may send at the same time
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        return self.connection
+
+    def __setstate__(self, connection):
+        self.__init__(connection)
+
+    def put(self, obj):
+        with self.lock:
+            self.connection.send(obj)
+
+
+def report_results(log, name, results):
+    """
+    Log harvest results received from harvester
+    :param name: harvester name
+    :param results: {'timestamp': datetime, 'status': 'ok' or 'error', ...}
+    """
+    if results['status'] == "ok":
+        if len(results['reap']) > 0:
+            log.info(
+                '[%(timestamp)s] %(key)s Harvester end work takes part in %(num)s giveaways, and YOU WIN something!' %
+                {'timestamp': results['timestamp'].strftime("%Y-%m-%d %H:%M:%S"), 'key': name,
+                 'num': len(results['sow'])})
+        else:
+            log.info(
+                "[%(timestamp)s] %(key)s Harvester end work: takes part in %(num)s giveaways, and you don't win anything. For now..." %
+                {'timestamp': results['timestamp'].strftime("%Y-%m-%d %H:%M:%S"), 'key': name,
+                 'num': len(results['sow'])})
+
+    elif results['status'] == "error":
+        log.error('[%(timestamp)s] %(key)s Harvester end work with error' %
+                  {'timestamp': results['timestamp'].strftime("%Y-%m-%d %H:%M:%S"), 'key': name})
+
+
 class GiveawayBot:
     def __init__(self, log_level):
         self.log_level = log_level
@@ -132,36 +488,638 @@ class GiveawayBot:
             self.log.addHandler(console)
         self.log.setLevel(self.log_level)
 
-        self.config = configparser.ConfigParser()
         try:
-            if TRAVIS_BUILD:
-                self.config.read_file(open("giveaway_bot.exp"))
-            else:
-                self.config.read_file(open("giveaway_bot.ini"))
+            self.config = get_config()
         except FileNotFoundError:
             self.log.error("No config file. Please copy «giveaway_bot.exp» as «giveaway_bot.ini» and edit it.")
             sys.exit()
+        except ConfigError as e:
+            self.log.error(e)
+            sys.exit()
 
         self.harvesters = [{"name": "SteamGifts"}, {"name": "IndieGala"}]
+        # Harvester name and read end of its results pipe
         self.processes_logs = {}
 
+        # Kept between harvests, replaced when executor changed in config
+        self.executor = None
+        # {'process', 'commands', 'reader'} of Steam lists worker, kept between harvests
+        self.steam_worker = None
+
     def start(self):
-        for harvester in self.harvesters:
-            enable = int(self.config[harvester['name']]['enable'])
-            if enable:
-                queue = multiprocessing.Queue()
-                self.processes_logs.update({harvester['name']: queue})
-                process = multiprocessing.Process(target=spawner, name=harvester['name'],
-                                                  args=(harvester['name'], queue, self.log_level))
-                process.start()
+        """
+        Start next harvest, workers and harvesters of previous harvests are reused
+        :return: names of harvesters started harvest
+        """
+        self.config = get_config()
+        enabled = [harvester['name'] for harvester in self.harvesters
+                   if int(self.config[harvester['name']]['enable'])]
+
+        name = executor_name(self.config['main'])
+        if self.executor is None or self.executor.name != name:
+            if self.executor is not None:
+                self.executor.close()
+            self.executor = EXECUTORS[name](self)
+
+        return self.executor.submit(enabled)
+
+    def _open_channel(self, name):
+        """
+        :param name: harvester name
+        :return: Channel for harvester results, read end kept in processes_logs
+        """
+        reader, writer = multiprocessing.Pipe(duplex=False)
+        self.processes_logs[name] = reader
+        return Channel(writer)
+
+    def _fetch_steam_data(self, enabled):
+        """
+        Fetch Steam lists once for all harvesters
+        :param enabled: names of enabled harvesters
+        :return: {'wishlist_ids': frozenset, 'library_ids': frozenset}, empty if failed
+        """
+        lists = self._steam_lists(enabled)
+        if not lists:
+            return {}
+
+        worker = self.steam_worker
+        if worker is None or not worker['process'].is_alive():
+            worker = self._start_steam_worker()
+
+        worker['commands'].put(('fetch', dict(self.config), lists))
+
+        # Results or exit of process, whatever first
+        if multiprocessing.connection.wait([worker['reader'], worker['process'].sentinel], self.harvest_timeout):
+            try:
+                results = worker['reader'].recv()
+            except EOFError:
+                results = {'status': 'error'}
+        else:
+            self.log.error("Steam lists are not fetched in time.")
+            worker['process'].terminate()
+            worker['reader'].close()
+            self.steam_worker = None
+            results = {'status': 'error'}
+
+        if results['status'] == 'ok':
+            return results['steam']
+        else:
+            self.log.warning("Can't fetch Steam lists, harvesters will fetch it itself.")
+            return {}
+
+    def _start_steam_worker(self):
+        """
+        :return: {'process': Steam lists worker, 'commands': queue of commands, 'reader': read end of results pipe}
+        """
+        if self.steam_worker is not None and not self.steam_worker['reader'].closed:
+            self.steam_worker['reader'].close()
+
+        reader, writer = multiprocessing.Pipe(duplex=False)
+        commands = multiprocessing.Queue()
+        # Daemon, so it don't outlive bot
+        process = multiprocessing.Process(target=steam_spawner, name='Steam', daemon=True,
+                                          args=(commands, Channel(writer), self.log_level, dict(self.config)))
+        process.start()
+        # Only worker writes, so its death closes pipe
+        writer.close()
+
+        self.steam_worker = {'process': process, 'commands': commands, 'reader': reader}
+        return self.steam_worker
+
+    def _steam_lists(self, enabled):
+        """
+        :param enabled: names of enabled harvesters
+        :return: Steam lists used by any of harvesters
+        """
+        lists = set()
+        for name in enabled:
+            lists |= HARVESTERS[name].steam_lists(self.config[name])
+
+        return lists
+
+    @property
+    def harvest_timeout(self):
+        """
+        :return: seconds given to harvest, sleepTime if not set
+        """
+        try:
+            minutes = int(self.config['main']['harvest_timeout'])
+        except KeyError:
+            minutes = 0
+
+        return (minutes or int(self.config['main']['sleepTime'])) * 60
+
+    def abort(self, pending):
+        """
+        Give up harvesters what not finished in time, their workers are killed and will be started again
+        :param pending: names of harvesters what not finished harvest yet, cleared
+        :return: list of harvester name and error results
+        """
+        collected = []
+        for name in sorted(pending):
+            self.log.error("%s harvester is not finished in time." % name)
+            collected.append((name, {'timestamp': datetime.now(), 'status': 'error', 'msg': 'Timed out'}))
+
+        if self.executor is not None:
+            self.executor.kill(pending)
+        pending.clear()
+
+        return collected
+
+    def collect(self, pending, timeout=None):
+        """
+        Wait until some harvester send results or its worker die
+        :param pending: names of harvesters what not finished harvest yet, updated in place
+        :param timeout: seconds to wait, None - until something happens
+        :return: list of harvester name and results
+        """
+        readers = {reader: name for name, reader in self.processes_logs.items()}
+        sentinels = self.executor.sentinels(pending) if self.executor else {}
+        if not readers and not sentinels:
+            time.sleep(timeout or 0)
+            return []
+
+        ready = multiprocessing.connection.wait(list(readers) + list(sentinels), timeout)
+
+        collected = []
+        for name in {readers.get(obj) or sentinels.get(obj) for obj in ready}:
+            reader = self.processes_logs.get(name)
+            if reader is None:
+                continue
+
+            try:
+                while reader.poll():
+                    results = reader.recv()
+                    # Late results of harvester what already reported or is given up
+                    if name not in pending:
+                        self.log.debug("Drop late results of %s harvester." % name)
+                        continue
+
+                    collected.append((name, results))
+                    pending.discard(name)
+            except EOFError:
+                # Write end closed, worker is gone
+                del self.processes_logs[name]
+                reader.close()
+
+        for name in [sentinels[obj] for obj in ready if obj in sentinels]:
+            if name in pending:
+                pending.discard(name)
+                self.log.error("%s worker is dead." % name)
+                collected.append((name, {'timestamp': datetime.now(), 'status': 'error', 'msg': 'Worker is dead'}))
+
+        return collected
 
     def stop(self):
+        if self.executor is not None:
+            self.executor.close()
+
         for child in multiprocessing.active_children():
             child.terminate()
 
         sys.exit()
 
 
+def executor_name(config):
+    """
+    :param config: main config section
+    :return: executor name, «process» if not set
+    """
+    try:
+        return config['executor']
+    except KeyError:
+        return 'process'
+
+
+class HarvestExecutor(metaclass=abc.ABCMeta):
+    """
+    Way to run harvesters, kept by bot between harvests
+    """
+    name = None
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.log = bot.log
+
+        try:
+            self.max_workers = int(bot.config['main']['workers'])
+        except KeyError:
+            self.max_workers = 0
+
+    @abc.abstractmethod
+    def submit(self, names):
+        """
+        Start harvest, harvesters send results to channels opened by bot
+        :param names: names of enabled harvesters
+        :return: names of harvesters started harvest
+        """
+        pass
+
+    def sentinels(self, names):
+        """
+        :param names: names of harvesters what not finished harvest
+        :return: dict of process sentinel and harvester name, sentinel is ready when process die
+        """
+        return {}
+
+    def close(self):
+        """
+        Let harvesters finish current harvest and free resources
+        """
+        pass
+
+    @abc.abstractmethod
+    def kill(self, names):
+        """
+        Stop harvest of harvesters what not finished in time, next harvest they start from scratch
+        :param names: names of harvesters
+        """
+        pass
+
+
+class InProcessExecutor(HarvestExecutor):
+    """
+    Harvesters in thread of main process, they share one interpreter and Steam parser
+    """
+    def __init__(self, bot):
+        super(InProcessExecutor, self).__init__(bot)
+        # Harvester name and harvester, kept between harvests
+        self.harvesters = {}
+        self.thread = None
+
+    def submit(self, names):
+        if self.thread is not None and self.thread.is_alive():
+            self.log.warning("Previous harvest is not finished yet, skip this one.")
+            return []
+
+        queues = {name: self.bot._open_channel(name) for name in names}
+        self.thread = threading.Thread(target=self._harvest, name='Harvesters', daemon=True, args=(names, queues))
+        self.thread.start()
+        return names
+
+    def _harvest(self, names, queues):
+        """
+        Report failure of whole harvest to every harvester, so main process don't wait forever
+        :param names: names of harvesters
+        :param queues: dict of harvester name and Channel for results
+        """
+        try:
+            self._run(names, queues, self.harvesters)
+        except Exception as e:
+            self.log.error("Harvesters failed: %r" % e)
+            for queue in queues.values():
+                queue.put({'timestamp': datetime.now(), 'status': 'error', 'msg': repr(e)})
+
+    @abc.abstractmethod
+    def _run(self, names, queues, harvesters):
+        pass
+
+    def kill(self, names):
+        # Threads can't be killed, leave thread with its harvesters behind and start next harvest in new thread
+        self.log.warning("Harvest thread can't be stopped, it is left behind.")
+        self.thread = None
+        self.harvesters = {name: harvester for name, harvester in self.harvesters.items() if name not in names}
+
+    def _fetch_steam_lists(self, names):
+        """
+        Fetch Steam lists once before harvesters use it
+        :param names: names of harvesters
+        """
+        steam = prepare_steam(Queue(), self.bot.log_level)
+        for name in self.bot._steam_lists(names):
+            try:
+                getattr(steam, '%s_ids' % name)
+            except Exception:
+                self.log.warning("Can't fetch Steam lists, harvesters will fetch it itself.")
+
+
+class SequentialExecutor(InProcessExecutor):
+    """
+    Harvesters one by one, least memory
+    """
+    name = 'sequential'
+
+    def _run(self, names, queues, harvesters):
+        self._fetch_steam_lists(names)
+        for name in names:
+            harvest(harvesters, name, queues[name], self.bot.log_level)
+
+
+class ThreadExecutor(InProcessExecutor):
+    """
+    Harvesters in threads of pool, «workers» threads or one per harvester
+    """
+    name = 'thread'
+
+    def _run(self, names, queues, harvesters):
+        self._fetch_steam_lists(names)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers or len(names) or 1) as pool:
+            list(pool.map(lambda name: harvest(harvesters, name, queues[name], self.bot.log_level), names))
+
+
+class AsyncExecutor(InProcessExecutor):
+    """
+    Harvesters in one event loop with concurrent requests
+    """
+    name = 'async'
+
+    def _run(self, names, queues, harvesters):
+        async_spawner(names, queues, self.bot.log_level, self.bot._steam_lists(names), harvesters)
+
+
+class ProcessExecutor(HarvestExecutor):
+    """
+    Long lived worker process per harvester, restarted if died
+    """
+    name = 'process'
+
+    def __init__(self, bot):
+        super(ProcessExecutor, self).__init__(bot)
+        # Harvester name and {'process', 'commands'} of worker, kept between harvests
+        self.workers = {}
+
+    def submit(self, names):
+        self._stop_workers([name for name in self.workers if name not in names])
+        steam_data = self.bot._fetch_steam_data(names)
+
+        started = []
+        for name in names:
+            worker = self.workers.get(name)
+            if worker is not None and not worker['process'].is_alive():
+                self.log.warning("%s worker is dead, restart it." % name)
+                worker = None
+
+            if worker is None:
+                worker = self._start_worker(name)
+            elif not worker['commands'].empty():
+                self.log.warning("%s worker is busy with previous harvest, skip this one." % name)
+                continue
+
+            worker['commands'].put(('harvest', dict(self.bot.config), steam_data))
+            started.append(name)
+
+        return started
+
+    def sentinels(self, names):
+        return {worker['process'].sentinel: name for name, worker in self.workers.items() if name in names}
+
+    def close(self):
+        self._stop_workers()
+
+    def kill(self, names):
+        for name in names:
+            worker = self.workers.pop(name, None)
+            if worker is not None:
+                worker['process'].terminate()
+
+    def _start_worker(self, name):
+        """
+        :param name: harvester name
+        :return: {'process': worker process, 'commands': queue of commands}
+        """
+        queue = self.bot._open_channel(name)
+        commands = multiprocessing.Queue()
+        # Daemon, so it don't outlive bot
+        process = multiprocessing.Process(target=worker_spawner, name=name, daemon=True,
+                                          args=(name, commands, queue, self.bot.log_level, dict(self.bot.config)))
+        process.start()
+        # Only worker writes, so its death closes pipe
+        queue.connection.close()
+
+        self.workers[name] = {'process': process, 'commands': commands}
+        return self.workers[name]
+
+    def _stop_workers(self, names=None):
+        """
+        Let workers finish current harvest and exit
+        :param names: names of harvesters, all if None
+        """
+        for name in list(self.workers) if names is None else names:
+            worker = self.workers.pop(name)
+            if worker['process'].is_alive():
+                worker['commands'].put(('stop', ))
+
+
+class PoolExecutor(HarvestExecutor):
+    """
+    Harvests in pool of «workers» processes or one per CPU, processes keep harvesters between harvests
+    """
+    name = 'pool'
+
+    def __init__(self, bot):
+        super(PoolExecutor, self).__init__(bot)
+        self.pool = None
+        # Harvester name and future of its last harvest
+        self.futures = {}
+
+    def submit(self, names):
+        steam_data = self.bot._fetch_steam_data(names)
+
+        started = []
+        for name in names:
+            # Results are sent just before task ends, give it a moment
+            future = self.futures.get(name)
+            if future is not None and concurrent.futures.wait([future], timeout=1).not_done:
+                self.log.warning("%s harvester is busy with previous harvest, skip this one." % name)
+                continue
+
+            queue = self.bot._open_channel(name)
+            future = self._submit(spawner, name, queue, self.bot.log_level, dict(self.bot.config), steam_data)
+            future.add_done_callback(functools.partial(self._done, name, queue))
+            self.futures[name] = future
+            started.append(name)
+
+        return started
+
+    def _submit(self, fn, *args):
+        """
+        Submit task to pool, new pool is started if there is none or some process of it died
+        :return: future of task
+        """
+        if self.pool is not None:
+            try:
+                return self.pool.submit(fn, *args)
+            except concurrent.futures.process.BrokenProcessPool:
+                self.log.warning("Process of pool died, start new pool.")
+
+        self.pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers or None)
+        return self.pool.submit(fn, *args)
+
+    def _done(self, name, queue, future):
+        """
+        Report harvest what failed without result, like crashed process of pool
+        """
+        error = future.exception()
+        if error is None:
+            return
+
+        # Harvester sent its error before pool broke
+        reader = self.bot.processes_logs.get(name)
+        if reader is not None and not reader.closed and reader.poll():
+            return
+
+        self.log.error("%s harvester failed: %r" % (name, error))
+        queue.put({'timestamp': datetime.now(), 'status': 'error', 'msg': repr(error)})
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False)
+            self.pool = None
+
+    def kill(self, names):
+        if self.pool is None:
+            return
+
+        # Task of pool can't be stopped alone, start new pool with all harvesters from scratch
+        processes = list((getattr(self.pool, '_processes', None) or {}).values())
+        self.close()
+        for process in processes:
+            process.terminate()
+
+
+EXECUTORS = {executor.name: executor for executor in (SequentialExecutor, ThreadExecutor, AsyncExecutor,
+                                                      ProcessExecutor, PoolExecutor)}
+
+
+class Cache:
+    # Access times of read items are written at once after this many reads
+    flush_reads = 100
+
+    def __init__(self, path, ttl=None, max_items=0, table='cache'):
+        """
+        Persistent key/value storage with per field expiration and LRU eviction
+        :param path: sqlite database file
+        :param ttl: dict of field name and seconds to keep it, 0 or missing field - keep forever
+        :param max_items: max count of stored keys, 0 - unlimited
+        :param table: table name, allow keep different data in one file
+        """
+        self.ttl = ttl or {}
+        self.max_items = max_items
+        self.table = table
+        # Key and access time of read items not written yet
+        self.accessed = {}
+
+        # Shared by harvesters threads of in-process executors
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self.db:
+            self.db.execute('CREATE TABLE IF NOT EXISTS %s '
+                            '(key TEXT PRIMARY KEY, data TEXT NOT NULL, accessed REAL NOT NULL)' % self.table)
+
+    def get(self, key):
+        """
+        :param key: item key
+        :return: dict of not expired fields, empty if nothing stored
+        """
+        with self.lock:
+            row = self.db.execute('SELECT data FROM %s WHERE key = ?' % self.table, (str(key),)).fetchone()
+            if row is None:
+                return {}
+
+            now = time.time()
+            self.accessed[str(key)] = now
+            if len(self.accessed) >= self.flush_reads:
+                with self.db:
+                    self._write_accessed()
+
+        fields = {}
+        for field, (value, updated) in json.loads(row[0]).items():
+            ttl = self.ttl.get(field, 0)
+            if not ttl or now - updated < ttl:
+                fields[field] = value
+
+        return fields
+
+    def set(self, key, fields):
+        """
+        Store fields of item and evict least recently used items above limit
+        :param key: item key
+        :param fields: dict of field name and json serializable value
+        """
+        now = time.time()
+        data = json.dumps({field: [value, now] for field, value in fields.items()})
+        with self.lock, self.db:
+            # Evicted items chosen by actual access times
+            self._write_accessed()
+            self.db.execute('INSERT OR REPLACE INTO %s (key, data, accessed) VALUES (?, ?, ?)' % self.table,
+                            (str(key), data, now))
+            if self.max_items:
+                self.db.execute('DELETE FROM %(table)s WHERE key NOT IN '
+                                '(SELECT key FROM %(table)s ORDER BY accessed DESC LIMIT ?)' % {'table': self.table},
+                                (self.max_items,))
+
+    def _write_accessed(self):
+        """
+        Write access times of read items in current transaction, lock must be held
+        """
+        self.db.executemany('UPDATE %s SET accessed = ? WHERE key = ?' % self.table,
+                            [(accessed, key) for key, accessed in self.accessed.items()])
+        self.accessed = {}
+
+    def close(self):
+        with self.lock, self.db:
+            self._write_accessed()
+        self.db.close()
+
+
+def open_cache(table, ttl=None):
+    """
+    Open persistent cache configured in «Cache» section
+    :param table: cache table name
+    :param ttl: dict of field name and seconds to keep it
+    :return: Cache or None if cache disabled
+    """
+    config = get_config().get('Cache', {})
+    if int(config.get('enable', 1)):
+        return Cache(config.get('file', 'giveaway_bot.cache'), ttl, int(config.get('max_items', 0)), table)
+    else:
+        return None
+
+
+class AsyncRunner:
+    def __init__(self, loop, limits, default_limit=4):
+        """
+        Run blocking requests in thread pool as coroutines, with per host concurrency limits
+        :param loop: event loop
+        :param limits: dict of host name and max concurrent requests to it
+        :param default_limit: limit for not listed hosts
+        """
+        self.loop = loop
+        self.limits = limits
+        self.default_limit = default_limit
+        self.semaphores = {}
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=sum(limits.values()) + default_limit)
+
+    def semaphore(self, url):
+        """
+        :param url: requested url
+        :return: semaphore of url host
+        """
+        host = urllib.parse.urlsplit(url).hostname
+        try:
+            return self.semaphores[host]
+        except KeyError:
+            semaphore = asyncio.Semaphore(self.limits.get(host, self.default_limit))
+            self.semaphores[host] = semaphore
+            return semaphore
+
+    async def run(self, url, fn, *args):
+        """
+        Call fn in thread pool
+        :param url: url requested by fn, None - fn don't make requests and run without limit
+        :return: fn result
+        """
+        call = functools.partial(fn, *args)
+        if url is None:
+            return await self.loop.run_in_executor(self.executor, call)
+
+        async with self.semaphore(url):
+            return await self.loop.run_in_executor(self.executor, call)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
 class Parser(metaclass=abc.ABCMeta):
     name = None
     verbose_name = None
@@ -188,12 +1146,7 @@ class Parser(metaclass=abc.ABCMeta):
             self.log.addHandler(console)
         self.log.setLevel(log_level)
 
-        self.config = configparser.ConfigParser()
-        if TRAVIS_BUILD:
-            self.config.read_file(open("giveaway_bot.exp"))
-        else:
-            self.config.read_file(open("giveaway_bot.ini"))
-        self.config = self.config[self.name]
+        self.config = get_config()[self.name]
 
         self.queue = queue
 
@@ -216,11 +1169,36 @@ class Parser(metaclass=abc.ABCMeta):
         if all(bool(self.cookies[key]) is False for key in self.cookies):
             self.cookies = None
 
-        self.cj = requests.utils.cookiejar_from_dict(self.cookies)
+        self.session = self._make_session()
 
-        self.session = requests.Session()
-        self.session.cookies = self.cj
+    def _make_session(self):
+        """
+        Create site session with connection pool configured in site section
+        :return: requests session
+        """
+        try:
+            pool_size = int(self.config['pool_size'])
+        except KeyError:
+            pool_size = 10
 
+        try:
+            keep_alive = int(self.config['keep_alive'])
+        except KeyError:
+            keep_alive = 1
+
+        session = RateLimitedSession()
+        session.cookies = requests.utils.cookiejar_from_dict(self.cookies)
+
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        if not keep_alive:
+            session.headers['Connection'] = 'close'
+
+        session.hooks['response'].append(rate_limit_hook)
+
+        return session
 
     def _crash(self, msg):
         """
@@ -229,22 +1207,47 @@ class Parser(metaclass=abc.ABCMeta):
         """
         timestamp = datetime.now()
         results = {'timestamp': timestamp, 'status': 'error', 'msg': msg}
-        self.queue.put(results)
 
         self.log.error(msg)
         if UNIT_TESTS:
+            self.queue.put(results)
             raise
-        else:
+        elif DEDICATED_WORKER and threading.current_thread() is threading.main_thread():
+            # Nothing else runs in worker, bot starts it again
+            self.queue.put(results)
             os._exit(1)
+        else:
+            # Process is shared with other harvesters or it is helper thread, error is sent by who stops harvest
+            raise Error(msg)
+
+
+    def _get_page(self, url, strainer=None, **kwargs):
+        """
+        Fetch page, parse it once and check what loged
+        :param url: page url
+        :param strainer: SoupStrainer to build tree only for needed elements, must include login element
+        :param kwargs: additional request arguments
+        :return: parsed page
+        """
+        html = self.session.get(url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}, **kwargs).content
+        soup = bs4.BeautifulSoup(html, PARSER, parse_only=strainer)
+        self._login_check(soup)
 
+        return soup
 
     def _login_check(self, html):
         """
         Check what loged before parse.
-        :param html: content if parsing page
+        :param html: content if parsing page, or already parsed page: BeautifulSoup or lxml tree
         """
-        soup = bs4.BeautifulSoup(html, PARSER)
-        login = soup.find(self.check_tag, {self.check_type, self.check_text})
+        if isinstance(html, bs4.BeautifulSoup):
+            login = html.find(self.check_tag, {self.check_type, self.check_text})
+        elif hasattr(html, 'xpath'):
+            login = html.xpath("//%s[%s]" % (self.check_tag, xpath_class(self.check_text)))
+        else:
+            soup = bs4.BeautifulSoup(html, PARSER)
+            login = soup.find(self.check_tag, {self.check_type, self.check_text})
+
         if login:
             self.login = True
             self.log.debug("%s login successful" % self.verbose_name)
@@ -270,6 +1273,13 @@ def singleton(class_):
             instances[class_] = class_(*args, **kwargs)
         return instances[class_]
 
+    def drop():
+        """
+        Forget instance, next call make new one
+        """
+        instances.pop(class_, None)
+
+    getinstance.drop = drop
     return getinstance
 
 
@@ -281,9 +1291,22 @@ class SteamParser(Parser):
     check_tag = "a"
     check_type = "class"
     check_text = "user_avatar"
+    store_url = "http://store.steampowered.com/"
     cookies = {'steamLogin': None}
+    app_fields = ('os_list', 'type', 'cards', 'title')
+
+    def __init__(self, queue, log_level):
+        super().__init__(queue, log_level)
+        self.apps = {}
+        # Message of crash, Steam data is needed by every giveaway so it is not requested again in this harvest
+        self.failure = None
+
+        config = get_config().get('Cache', {})
+        ttl = {field: int(config.get('%s_ttl' % field, 0)) * 3600 for field in self.app_fields}
+        self.cache = open_cache('apps', ttl)
 
     @property
+    @stop_after_crash
     @retrying
     @caching_property
     def wishlist(self):
@@ -295,10 +1318,7 @@ class SteamParser(Parser):
         wishlist = []
 
         url = "http://steamcommunity.com/profiles/%s/wishlist/" % self.config["steamLogin"][:17]
-        html = self.session.get(url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
-        self._login_check(html)
-
-        soup = bs4.BeautifulSoup(html, PARSER)
+        soup = self._get_page(url)
         items = soup.find_all('div', {"class", 'wishlistRow'})
         for item in items:
             try:
@@ -329,6 +1349,7 @@ class SteamParser(Parser):
         return wishlist
 
     @property
+    @stop_after_crash
     @retrying
     @caching_property
     def library(self):
@@ -337,31 +1358,167 @@ class SteamParser(Parser):
         """
         self.log.info('Fetching Steam Library.')
 
-        library = []
-
         url = "%s/profiles/%s/games/?tab=all" % (self.site_url, self.config["steamLogin"][:17])
-        html = self.session.get(url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
-        self._login_check(html)
-
-        for row in html.decode().splitlines():
-            if 'var rgGames = ' in row:
-                library = json.loads(str.strip(str.rstrip(str.replace(row, 'var rgGames = ', ''), ';')))
+        response = self.session.get(url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}, stream=True)
+        try:
+            library = self._parse_library(response.iter_content(chunk_size=64 * 1024))
+        finally:
+            response.close()
 
         self.log.info('In You Steam Library %s games.' % len(library))
 
         return library
 
+    @staticmethod
+    def _parse_library(chunks):
+        """
+        Decode games from library page chunk by chunk, page itself never kept in memory
+        :param chunks: iterable of page content bytes
+        :return: list of {'appid': int, 'name': str}
+        """
+        marker = b'var rgGames = '
+        chunks = iter(chunks)
+
+        # Page without games list means that we not logged in
+        tail = b''
+        for chunk in chunks:
+            data = tail + chunk
+            pos = data.find(marker)
+            if pos != -1:
+                data = data[pos + len(marker):]
+                break
+            tail = data[-len(marker):]
+        else:
+            raise AuthError
+
+        text_decoder = codecs.getincrementaldecoder('utf-8')()
+        json_decoder = json.JSONDecoder()
+        skip = re.compile(r'[\s,]*')
+
+        buffer = text_decoder.decode(data).lstrip()
+        while not buffer:
+            try:
+                buffer = text_decoder.decode(next(chunks)).lstrip()
+            except StopIteration:
+                raise ParseError
+
+        if buffer[0] != '[':
+            raise ParseError
+
+        library = []
+        pos = 1
+        while True:
+            pos = skip.match(buffer, pos).end()
+            if pos < len(buffer) and buffer[pos] == ']':
+                break
+
+            try:
+                game, pos = json_decoder.raw_decode(buffer, pos)
+            except json.decoder.JSONDecodeError:
+                # Game record not fully loaded yet
+                try:
+                    buffer = buffer[pos:] + text_decoder.decode(next(chunks))
+                except StopIteration:
+                    raise ParseError
+                pos = 0
+                continue
+
+            library.append({'appid': game['appid'], 'name': game['name']})
+
+        return library
+
+    def _crash(self, msg):
+        self.failure = msg
+        super()._crash(msg)
+
+    def preload(self, data):
+        """
+        Use Steam lists fetched in other process
+        :param data: {'wishlist_ids': frozenset, 'library_ids': frozenset}
+        """
+        for name, value in data.items():
+            setattr(self, 'cached_%s' % name, value)
+
+    def reset(self, queue):
+        """
+        Forget Steam lists and apps fetched for previous harvest, apps data is kept in cache only
+        :param queue: queue for error messages of new harvest
+        """
+        self.queue = queue
+        self.apps = {}
+        self.failure = None
+        for name in ('wishlist', 'library', 'wishlist_apps', 'wishlist_ids', 'library_apps', 'library_ids'):
+            try:
+                delattr(self, 'cached_%s' % name)
+            except AttributeError:
+                pass
+
+    @property
+    @caching_property
+    def wishlist_apps(self):
+        """
+        :return: read only map of wishlist game id and wishlist record
+        """
+        return types.MappingProxyType({game['id']: game for game in self.wishlist})
+
+    @property
+    @caching_property
+    def wishlist_ids(self):
+        return frozenset(self.wishlist_apps)
+
+    @property
+    @caching_property
+    def library_apps(self):
+        """
+        :return: read only map of library game id and library record
+        """
+        return types.MappingProxyType({game['appid']: game for game in self.library})
+
+    @property
+    @caching_property
+    def library_ids(self):
+        return frozenset(self.library_apps)
+
+    @stop_after_crash
     @retrying
-    def get_os_list(self, game_id):
+    def get_app_info(self, game_id):
         """
-        Return list of game supported OS
+        Fetch steam store page once and return all app data needed by filters
         :param game_id: steam game id
-        :return: ['win', 'lin', 'mac']
+        :return: {'os_list': ['win', 'lin', 'mac'], 'type': 'game'|'dlc', 'cards': True|False, 'title': str}
         """
-        os_list = []
-        url = "http://store.steampowered.com/app/%s" % game_id
+        try:
+            return self.apps[game_id]
+        except KeyError:
+            pass
+
+        if self.cache:
+            app_info = self.cache.get(game_id)
+            if all(field in app_info for field in self.app_fields):
+                self.apps[game_id] = app_info
+                return app_info
+
+        url = "%sapp/%s" % (self.store_url, game_id)
         html = self.session.get(url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
+        app_info = self._parse_app_page(html)
+        self.apps[game_id] = app_info
+
+        # Page without title is not app page(age check, region lock, etc.), don't remember it between runs
+        if self.cache and app_info['title'] is not None:
+            self.cache.set(game_id, app_info)
+
+        return app_info
+
+    @staticmethod
+    def _parse_app_page(html):
+        """
+        Extract platforms, type, cards support and title from steam store app page
+        :param html: content of store page
+        :return: app info dict
+        """
         soup = bs4.BeautifulSoup(html, PARSER)
+
+        os_list = []
         if soup.find('span', {'class': 'platform_img win'}):
             os_list.append('win')
 
@@ -371,88 +1528,227 @@ class SteamParser(Parser):
         if soup.find('span', {'class': 'platform_img mac'}):
             os_list.append('mac')
 
-        return os_list
+        # TODO add other types like film
+        if soup.find('div', {'class': 'game_area_dlc_bubble'}):
+            app_type = 'dlc'
+        else:
+            app_type = 'game'
+
+        cards = False
+        categories = soup.find('div', {'id': 'category_block'})
+        if categories:
+            for img in categories.find_all('img', {'class': 'category_icon'}):
+                if 'ico_cards.png' in img['src']:
+                    cards = True
+                    break
+
+        title = soup.find('div', {'class': 'apphub_AppName'})
+        if title:
+            title = title.text
+
+        return {'os_list': os_list, 'type': app_type, 'cards': cards, 'title': title}
+
+    def get_os_list(self, game_id):
+        """
+        Return list of game supported OS
+        :param game_id: steam game id
+        :return: ['win', 'lin', 'mac']
+        """
+        return self.get_app_info(game_id)['os_list']
 
-    @retrying
     def get_type(self, game_id):
-        # TODO add other types like film
         """
         Return app type
         :param game_id: steam game id
         :return: now can return only 'dlc' and 'game'
         """
-        url = "http://store.steampowered.com/app/%s" % game_id
-        html = self.session.get(url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
-        soup = bs4.BeautifulSoup(html, PARSER)
-        if soup.find('div', {'class': 'game_area_dlc_bubble'}):
-            return 'dlc'
-        else:
-            return 'game'
+        return self.get_app_info(game_id)['type']
 
-    @retrying
     def get_cards(self, game_id):
         """
         Return cards support status
         :param game_id:
         :return: True or False
         """
-        cards = False
+        return self.get_app_info(game_id)['cards']
+
+    def get_title(self, game_id):
+        return self.get_app_info(game_id)['title']
+
+
+class Harvester(Parser):
+    required_filters = []
+    disabled_filters = []
+    internal_filters = []
+
+    def __init__(self, queue, log_level):
+        super(Harvester, self).__init__(queue, log_level)
+        self.filters = self.parse_filters(self.config)
+
+        self.trust_cache = {}
+        try:
+            trust_ttl = int(self.config['trust_ttl'])
+        except KeyError:
+            trust_ttl = 0
+
+        if trust_ttl:
+            self.authors = open_cache('authors', {'trust_points': trust_ttl * 3600})
+        else:
+            self.authors = None
+
+        try:
+            self.trust_workers = int(self.config['trust_workers'])
+        except KeyError:
+            self.trust_workers = 4
+
+        try:
+            self.prefetch = int(self.config['prefetch'])
+        except KeyError:
+            self.prefetch = 2
 
-        url = "http://store.steampowered.com/app/%s" % game_id
-        html = self.session.get(url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
-        soup = bs4.BeautifulSoup(html, PARSER)
-        categories = soup.find('div', {'id': 'category_block'})
-        for img in categories.find_all('img', {'class': 'category_icon'}):
-            if 'ico_cards.png' in img['src']:
-                cards = True
-                break
+        try:
+            self.selection = self.config['selection']
+        except KeyError:
+            self.selection = 'greedy'
+
+        try:
+            self.horizon = int(self.config['horizon'])
+        except KeyError:
+            self.horizon = 3
 
-        return cards
+        try:
+            self.score = [factor.strip() for factor in self.config['score'].split(',') if factor.strip()]
+        except KeyError:
+            self.score = ['entries']
 
-    @retrying
-    def get_title(self, game_id):
-        url = "http://store.steampowered.com/app/%s" % game_id
-        html = self.session.get(url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
-        soup = bs4.BeautifulSoup(html, PARSER)
-        return soup.find('div', {'class': 'apphub_AppName'}).text
+        try:
+            self.selection_time = float(self.config['selection_time'])
+        except KeyError:
+            self.selection_time = 1.0
 
+        # Filter key and [passed, checked] giveaways count, kept between pages
+        self.filter_stats = {}
 
-class Harvester(Parser):
-    required_filters = []
-    disabled_filters = []
-    internal_filters = []
+        try:
+            self.reap_interval = float(self.config['reap_interval'])
+        except KeyError:
+            self.reap_interval = 0
 
-    def __init__(self, queue, log_level):
-        super(Harvester, self).__init__(queue, log_level)
-        self.filters = self.required_filters
+        # Time, won list fingerprint and result of last reap, kept between harvests
+        self.last_reap = {}
+        # Same, kept between runs if cache enabled
+        self.reap_state = open_cache('reap')
+
+    @classmethod
+    def parse_filters(cls, config):
+        """
+        :param config: harvester config section
+        :return: list of filters names, arged filters as [name, arg]
+        """
+        filters = list(cls.required_filters)
         # I know it's shit ^_^
         try:
-            # list(map(lambda s: self.filters.append(s) if s not in self.filters else None,
+            # list(map(lambda s: filters.append(s) if s not in filters else None,
             #          map(lambda s: s if len(s) > 1 else s[0],
             #              map(lambda s: list(map(lambda s: s.strip(), s)),
             #                  map(lambda s: s.split('='),
-            #                      map(lambda s: s if s else None, self.config['filters'].split(',')))))))
+            #                      map(lambda s: s if s else None, config['filters'].split(',')))))))
 
-            [self.filters.append(x) for x in
+            [filters.append(x) for x in
                 [x if len(x) > 1 else x[0] for x in
                     [[x.strip() for x in x.split('=')] for x in
-                        [x for x in self.config['filters'].split(',') if x]]] if x not in self.filters]
+                        [x for x in config['filters'].split(',') if x]]] if x not in filters]
         except (KeyError, AttributeError):
             pass
 
-        self.filters = [f for f in self.filters if f not in self.disabled_filters]
+        filters = [f for f in filters if f not in cls.disabled_filters]
 
-        if 'wishlist' in self.filters:
+        if 'wishlist' in filters:
             try:
-                self.filters.remove('library')
+                filters.remove('library')
             except ValueError:
                 pass
 
+        return filters
+
+    @classmethod
+    def steam_lists(cls, config):
+        """
+        :param config: harvester config section
+        :return: Steam lists used by harvester filters, 'wishlist' and 'library'
+        """
+        return {f for f in cls.parse_filters(config) if f in ('wishlist', 'library') and f not in cls.internal_filters}
+
     def start(self):
         self.log.info("Starting %s harvester..." % self.verbose_name)
 
-        sow = self._sow()
-        reap = self._reap()
+        # Reap don't depend on sow, do it meanwhile
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            reaping = executor.submit(self._scheduled_reap)
+            self._prepare()
+            sow = self._sow()
+            reap = reaping.result()
+        self._finish(sow, reap)
+
+    async def async_start(self, runner):
+        """
+        Same as start, but requests made concurrently in runner's event loop
+        :param runner: AsyncRunner shared by all harvesters
+        """
+        self.log.info("Starting %s harvester..." % self.verbose_name)
+
+        # Reap may wait for site a long time, don't hold host slot meanwhile
+        reaping = asyncio.ensure_future(runner.run(None, self._scheduled_reap))
+        await runner.run(self.site_url, self._prepare)
+        sow = await self._async_sow(runner)
+        reap = await reaping
+        self._finish(sow, reap)
+
+    def _scheduled_reap(self):
+        """
+        Reap if reap_interval passed since last reap and won list changed
+        :return: won giveaways, result of last reap if skipped
+        """
+        state = self.last_reap
+        if not state and self.reap_state:
+            state = self.reap_state.get(self.name)
+
+        now = time.time()
+        if 'time' in state and now - state['time'] < self.reap_interval * 60:
+            self.log.debug("Reap skipped, it was %.0f minutes ago." % ((now - state['time']) / 60))
+            return state.get('result', [])
+
+        try:
+            fingerprint = self._reap_fingerprint()
+            if fingerprint is not None and fingerprint == state.get('fingerprint'):
+                self.log.debug("Reap skipped, won list is not changed.")
+                reap = state.get('result', [])
+            else:
+                reap = self._reap()
+        except Exception as e:
+            # Sow goes on meanwhile, don't lose it, reap again next harvest
+            self.log.warning("Reap failed, try again next harvest: %s" % (e if isinstance(e, Error) else repr(e)))
+            return state.get('result', [])
+
+        self.last_reap = {'time': now, 'fingerprint': fingerprint, 'result': reap}
+        if self.reap_state:
+            self.reap_state.set(self.name, self.last_reap)
+
+        return reap
+
+    def _reap_fingerprint(self):
+        """
+        Cheap value what changes when won list changes
+        :return: fingerprint or None if site has not it, then reap every time
+        """
+        return None
+
+    def _finish(self, sow, reap):
+        """
+        Send harvest results to main process
+        :param sow: entered giveaways
+        :param reap: won giveaways
+        """
         if reap:
             self.log.info('You have not accepted prizes, check it at %s !' % self.site_url)
         else:
@@ -465,6 +1761,23 @@ class Harvester(Parser):
 
         self.queue.put(results)
 
+    def reset(self, queue):
+        """
+        Forget account state and authors fetched for previous harvest, session and persistent caches are kept
+        :param queue: queue for results of new harvest
+        """
+        self.queue = queue
+        self.trust_cache = {}
+        for name in ('account', 'level', 'points'):
+            try:
+                delattr(self, 'cached_%s' % name)
+            except AttributeError:
+                pass
+
+    @property
+    def steam(self):
+        return SteamParser(self.queue, self.log_level)
+
     @property
     @abc.abstractproperty
     def level(self):
@@ -480,25 +1793,17 @@ class Harvester(Parser):
         sow = True
         points = self.points
 
-        page = 1
-        while sow:
-            giveaways = self._get_giveaways(page)
-            if not giveaways:
-                self.log.info('No more giveaways.')
-                break
-
-            for flt in self.filters:
-                if flt not in self.internal_filters:
-                    try:
-                        if isinstance(flt, str):
-                            giveaways = getattr(self, "_filter_%s" % flt)(giveaways)
-                        elif isinstance(flt, list):
-                            giveaways = getattr(self, "_arged_filter_%s" % flt[0])(giveaways, flt[1])
-                    except AttributeError:
-                        continue
-
-            page += 1
+        pages = self._iter_pages()
+        if self.selection == 'knapsack':
+            candidates = []
+            for giveaways in itertools.islice(pages, self.horizon):
+                candidates += self._apply_filters(giveaways)
+            pages.close()
+            batches = [self._select(candidates, int(points))]
+        else:
+            batches = (self._apply_filters(giveaways) for giveaways in pages)
 
+        for giveaways in batches:
             for giveaway in giveaways:
                 if int(points) >= int(giveaway.points):
                     status = self._enter_giveaway(giveaway)
@@ -511,8 +1816,346 @@ class Harvester(Parser):
                     sow = False
                     break
 
+            if not sow:
+                break
+
+        # Cancel fetching of pages what will not be used
+        pages.close()
+
+        return giveaways_enter
+
+    def _iter_pages(self):
+        """
+        Giveaways pages until empty one, up to prefetch pages fetched in background while current page in work
+        :return: generator of giveaways lists
+        """
+        if not self.prefetch:
+            page = 1
+            while True:
+                giveaways = self._get_giveaways(page)
+                if not giveaways:
+                    self.log.info('No more giveaways.')
+                    return
+                yield giveaways
+                page += 1
+
+        pages = Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+
+        def fetch():
+            page = 1
+            while not stop.is_set():
+                try:
+                    giveaways = self._get_giveaways(page)
+                except Exception as e:
+                    giveaways = e
+
+                while not stop.is_set():
+                    try:
+                        pages.put(giveaways, timeout=0.1)
+                        break
+                    except Full:
+                        continue
+
+                if not giveaways or isinstance(giveaways, Exception):
+                    return
+                page += 1
+
+        fetcher = threading.Thread(target=fetch, name='%s pages' % self.name, daemon=True)
+        fetcher.start()
+        try:
+            while True:
+                giveaways = pages.get()
+                if isinstance(giveaways, Exception):
+                    raise giveaways
+                if not giveaways:
+                    self.log.info('No more giveaways.')
+                    return
+                yield giveaways
+        finally:
+            stop.set()
+
+    async def _async_sow(self, runner):
+        """
+        Same as _sow, but data for network filters and entries requested concurrently
+        :param runner: AsyncRunner
+        :return: entered giveaways
+        """
+        giveaways_enter = []
+        points = await runner.run(self.site_url, getattr, self, 'points')
+        await self._async_prefetch_cached(runner)
+
+        async def enter(giveaways):
+            """
+            Enter at once all giveaways what we can pay, in page order
+            :return: False if not enough points for next giveaway
+            """
+            nonlocal points
+            while giveaways:
+                batch = []
+                cost = 0
+                for giveaway in giveaways:
+                    if int(points) - cost < int(giveaway.points):
+                        break
+                    cost += int(giveaway.points)
+                    batch.append(giveaway)
+
+                if not batch:
+                    self.log.info("Not Enough Points.")
+                    return False
+
+                giveaways = giveaways[len(batch):]
+                statuses = await asyncio.gather(*[runner.run(self.site_url, self._enter_giveaway, giveaway)
+                                                  for giveaway in batch])
+                for giveaway, status in zip(batch, statuses):
+                    if status == 'ok':
+                        points = int(points) - int(giveaway.points)
+                        giveaways_enter.append({'title': giveaway.title, 'href': giveaway.href})
+                        self.log.info('Take part in «%s» giveaway.' % giveaway.title)
+
+            return True
+
+        # Next pages requested while current page in work
+        fetching = collections.deque()
+        candidates = []
+        page = 1
+        pages_done = 0
+        while True:
+            while len(fetching) < self.prefetch + 1:
+                fetching.append(asyncio.ensure_future(runner.run(self.site_url, self._get_giveaways, page)))
+                page += 1
+
+            giveaways = await fetching.popleft()
+            if not giveaways:
+                self.log.info('No more giveaways.')
+                break
+
+            # Network data requested only for giveaways passed cheap filters
+            giveaways = await runner.run(None, self._apply_filters, giveaways, (COST_LOCAL, COST_CACHED))
+            await self._async_prefetch(runner, giveaways)
+            giveaways = await runner.run(None, self._apply_filters, giveaways, (COST_NETWORK, ))
+            pages_done += 1
+
+            if self.selection == 'knapsack':
+                candidates += giveaways
+                if pages_done >= self.horizon:
+                    break
+            elif not await enter(giveaways):
+                break
+
+        for future in fetching:
+            future.cancel()
+
+        if self.selection == 'knapsack':
+            await self._async_prefetch_score(runner, candidates)
+            # Selection takes up to selection_time, other harvesters go on meanwhile
+            await enter(await runner.run(None, self._select, candidates, int(points)))
+
         return giveaways_enter
 
+    def _score(self, giveaway):
+        """
+        Giveaway value for selection, product of configured score factors
+        :param giveaway: giveaway
+        :return: positive number
+        """
+        score = 1.0
+        for factor in self.score:
+            try:
+                if factor == 'wishlist':
+                    score *= 10 if giveaway.in_wishlist else 1
+                elif factor == 'entries' and giveaway.entries is not None:
+                    # Chance to win
+                    score /= giveaway.entries + 1
+                elif factor == 'ending' and giveaway.end_time is not None:
+                    score /= max(giveaway.end_time - time.time(), 0) / 3600 + 1
+            except Error:
+                raise
+            except Exception:
+                continue
+
+        return score
+
+    def _select(self, giveaways, points):
+        """
+        Choose giveaways with max total score what we can pay, 0/1 knapsack
+        :param giveaways: candidates
+        :param points: available points
+        :return: chosen giveaways in candidates order
+        """
+        scores = [self._score(g) for g in giveaways]
+        costs = [max(int(g.points), 0) for g in giveaways]
+        deadline = time.monotonic() + self.selection_time
+
+        # best[budget] - max score with that budget, taken[i][budget] - giveaway i is in that best set
+        best = [0.0] * (points + 1)
+        taken = []
+        for score, cost in zip(scores, costs):
+            if time.monotonic() > deadline:
+                self.log.debug("Selection is too long, choose greedy.")
+                return self._select_greedy(giveaways, scores, costs, points)
+
+            row = bytearray(points + 1)
+            for budget in range(points, cost - 1, -1):
+                value = best[budget - cost] + score
+                if value > best[budget]:
+                    best[budget] = value
+                    row[budget] = 1
+            taken.append(row)
+
+        chosen = []
+        budget = points
+        for i in range(len(taken) - 1, -1, -1):
+            if taken[i][budget]:
+                chosen.append(i)
+                budget -= costs[i]
+
+        return [giveaways[i] for i in sorted(chosen)]
+
+    @staticmethod
+    def _select_greedy(giveaways, scores, costs, points):
+        """
+        Fast approximate selection, best score per point first
+        :return: chosen giveaways in candidates order
+        """
+        chosen = []
+        for i in sorted(range(len(giveaways)), key=lambda i: scores[i] / (costs[i] or 0.1), reverse=True):
+            if costs[i] <= points:
+                chosen.append(i)
+                points -= costs[i]
+
+        return [giveaways[i] for i in sorted(chosen)]
+
+    async def _async_prefetch(self, runner, giveaways):
+        """
+        Concurrently request data of network filters, so filters will take it from caches
+        :param runner: AsyncRunner
+        :param giveaways: list of giveaways
+        """
+        filters = [flt for flt in self.filters if flt not in self.internal_filters]
+        names = {key.split('=')[0] for key, fn, args in self._ordered_filters() if fn.cost == COST_NETWORK}
+
+        jobs = []
+        if 'trust' in filters or any(isinstance(flt, list) and flt[0] == 'trust' and int(flt[1]) > -1
+                                     for flt in filters):
+            profile_urls = {getattr(g, 'profile_url', None) for g in giveaways} - set(self.trust_cache) - {None, ''}
+            jobs += [runner.run(url, self._get_trust_points, url) for url in profile_urls]
+
+        # Library checked on giveaway page of site
+        if 'library' in names:
+            jobs += [runner.run(g.href, getattr, g, 'in_library') for g in giveaways]
+
+        # Game ids from giveaway pages, wishlist and apps info from Steam
+        steam = self.steam
+        if 'wishlist' in names:
+            jobs.append(runner.run(steam.site_url, getattr, steam, 'wishlist_ids'))
+
+        fetching_ids = None
+        if names & {'wishlist', 'os', 'dlc', 'cards'}:
+            fetching_ids = asyncio.gather(*[runner.run(g.href, getattr, g, 'game_id') for g in giveaways],
+                                          return_exceptions=True)
+            jobs.append(fetching_ids)
+
+        await asyncio.gather(*jobs, return_exceptions=True)
+
+        if names & {'os', 'dlc', 'cards'}:
+            game_ids = {game_id for game_id in fetching_ids.result() if not isinstance(game_id, Exception)}
+            await asyncio.gather(*[runner.run(steam.store_url, steam.get_app_info, game_id) for game_id in game_ids],
+                                 return_exceptions=True)
+
+    async def _async_prefetch_cached(self, runner):
+        """
+        Request data of cached filters, so filters applied out of host limits will take it from caches
+        :param runner: AsyncRunner
+        """
+        names = {key.split('=')[0] for key, fn, args in self._ordered_filters() if fn.cost == COST_CACHED}
+
+        jobs = []
+        if 'level' in names:
+            jobs.append(runner.run(self.site_url, getattr, self, 'level'))
+
+        steam = self.steam
+        jobs += [runner.run(steam.site_url, getattr, steam, '%s_ids' % name) for name in names & {'wishlist', 'library'}]
+
+        # Filters report errors as before
+        await asyncio.gather(*jobs, return_exceptions=True)
+
+    async def _async_prefetch_score(self, runner, giveaways):
+        """
+        Request data of score factors, so selection will take it from caches
+        :param runner: AsyncRunner
+        :param giveaways: candidates
+        """
+        if 'wishlist' not in self.score:
+            return
+
+        steam = self.steam
+        jobs = [runner.run(steam.site_url, getattr, steam, 'wishlist_ids')]
+        jobs += [runner.run(g.href, getattr, g, 'game_id') for g in giveaways]
+
+        # Score reports errors as before
+        await asyncio.gather(*jobs, return_exceptions=True)
+
+    def _apply_filters(self, giveaways, costs=None):
+        """
+        :param giveaways: list of giveaways
+        :param costs: apply only filters of this cost classes, None - all
+        :return: giveaways passed all not internal filters
+        """
+        for key, fn, args in self._ordered_filters():
+            if not giveaways:
+                break
+            if costs is not None and fn.cost not in costs:
+                continue
+
+            checked = len(giveaways)
+            try:
+                giveaways = fn(giveaways, *args)
+            except AttributeError:
+                continue
+
+            stats = self.filter_stats.setdefault(key, [0, 0])
+            stats[0] += len(giveaways)
+            stats[1] += checked
+
+        return giveaways
+
+    def _ordered_filters(self):
+        """
+        Not internal filters, cheap first and most selective by observed pass rate first in the same cost class
+        :return: list of (filter key, method, arguments)
+        """
+        chain = []
+        for flt in self.filters:
+            if flt in self.internal_filters:
+                continue
+
+            if isinstance(flt, str):
+                key = flt
+                fn = getattr(self, "_filter_%s" % flt, None)
+                args = ()
+            else:
+                key = '%s=%s' % (flt[0], flt[1])
+                fn = getattr(self, "_arged_filter_%s" % flt[0], None)
+                args = (flt[1], )
+
+            if fn is None:
+                continue
+
+            passed, checked = self.filter_stats.get(key, (0, 0))
+            pass_rate = (passed + 1) / (checked + 2)
+            chain.append((getattr(fn, 'cost', COST_NETWORK), pass_rate, key, fn, args))
+
+        chain.sort(key=lambda f: f[:2])
+
+        return [(key, fn, args) for cost, pass_rate, key, fn, args in chain]
+
+    def _prepare(self):
+        """
+        Harvest setup stage, called once before sowing
+        """
+        pass
+
     @abc.abstractmethod
     def _reap(self):
         pass
@@ -522,25 +2165,104 @@ class Harvester(Parser):
         pass
 
     def _enter_giveaway(self, giveaway):
-        status = giveaway.enter()
-        return status
+        policy = RetryPolicy.from_config(self.config)
+
+        attempt = 0
+        started = time.monotonic()
+        while True:
+            try:
+                status = giveaway.enter()
+                return status
+            except RateLimitError as e:
+                # Entry was not accepted, safe to send it again
+                if not policy.wait(attempt, started, e.retry_after):
+                    self.log.warning("%s asks to slow down, skip «%s» giveaway." % (self.verbose_name, giveaway.title))
+                    return 'error'
+            attempt += 1
+
+    def _get_trust_points(self, profile_url):
+        """
+        Author's trust points, each author fetched once per harvest
+        :param profile_url: author's profile page
+        """
+        try:
+            return self.trust_cache[profile_url]
+        except KeyError:
+            pass
+
+        if self.authors:
+            trust_points = self.authors.get(profile_url).get('trust_points')
+            if trust_points is not None:
+                self.trust_cache[profile_url] = trust_points
+                return trust_points
+
+        trust_points = self._fetch_trust_points(profile_url)
+        self.trust_cache[profile_url] = trust_points
+        if self.authors:
+            self.authors.set(profile_url, {'trust_points': trust_points})
+
+        return trust_points
 
+    @abc.abstractmethod
+    def _fetch_trust_points(self, profile_url):
+        pass
+
+    def _prefetch_trust_points(self, giveaways):
+        """
+        Fetch trust points of all unknown authors in parallel
+        :param giveaways: list of giveaways
+        """
+        profile_urls = set()
+        for g in giveaways:
+            profile_url = getattr(g, 'profile_url', None)
+            if profile_url and profile_url not in self.trust_cache:
+                profile_urls.add(profile_url)
+
+        if self.authors:
+            for profile_url in list(profile_urls):
+                trust_points = self.authors.get(profile_url).get('trust_points')
+                if trust_points is not None:
+                    self.trust_cache[profile_url] = trust_points
+                    profile_urls.remove(profile_url)
+
+        if not profile_urls:
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.trust_workers) as executor:
+            futures = {executor.submit(self._fetch_trust_points, url): url for url in profile_urls}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    trust_points = future.result()
+                except Exception:
+                    # Will be fetched again and excluded by filter
+                    continue
+
+                self.trust_cache[futures[future]] = trust_points
+                if self.authors:
+                    self.authors.set(futures[future], {'trust_points': trust_points})
+
+    @filter_cost(COST_NETWORK)
     def _filter_trust(self, giveaways):
         """
         Exclude giveaways base on author's feedback
         :param giveaway:
         :return: equal  trust=1
         """
+        self._prefetch_trust_points(giveaways)
+
         filtred_giveaways = []
         for g in giveaways:
             try:
                 if int(g.trust_points) > 0:
                     filtred_giveaways.append(g)
+            except Error:
+                raise
             except:
                 pass
 
         return filtred_giveaways
 
+    @filter_cost(COST_NETWORK)
     def _arged_filter_trust(self, giveaways, trust):
         """
         Exclude giveaways base on author's feedback
@@ -552,15 +2274,20 @@ class Harvester(Parser):
         if int(trust) <= -1:
             return giveaways
         else:
+            self._prefetch_trust_points(giveaways)
+
             for g in giveaways:
                 try:
                     if int(g.trust_points) >= int(trust):
                         filtered_giveaways.append(g)
+                except Error:
+                    raise
                 except:
                     pass
 
             return filtered_giveaways
 
+    @filter_cost(COST_LOCAL)
     def _arged_filter_max_points(self, giveaways, points):
         """
         Exclude giveaways coast more then points
@@ -572,11 +2299,14 @@ class Harvester(Parser):
             try:
                 if int(g.points) <= int(points):
                     filtered_giveaways.append(g)
+            except Error:
+                raise
             except:
                 pass
 
         return filtered_giveaways
 
+    @filter_cost(COST_LOCAL)
     def _arged_filter_min_points(self, giveaways, points):
         """
         Exclude giveaways coast less then points
@@ -588,11 +2318,14 @@ class Harvester(Parser):
             try:
                 if int(g.points) >= int(points):
                     filtered_giveaways.append(g)
+            except Error:
+                raise
             except:
                 pass
 
         return filtered_giveaways
 
+    @filter_cost(COST_CACHED)
     def _filter_level(self, giveaways):
         """
         Exclude giveaways that to height level
@@ -602,11 +2335,14 @@ class Harvester(Parser):
             try:
                 if int(g.level) <= self.level:
                     filtered_giveaways.append(g)
+            except Error:
+                raise
             except:
                 pass
 
         return filtered_giveaways
 
+    @filter_cost(COST_LOCAL)
     def _arged_filter_min_level(self, giveaways, level):
         """
         Exclude giveaways with lesser level
@@ -618,11 +2354,14 @@ class Harvester(Parser):
             try:
                 if int(g.level) >= int(level):
                     filtered_giveaways.append(g)
+            except Error:
+                raise
             except:
                 pass
 
         return filtered_giveaways
 
+    @filter_cost(COST_NETWORK)
     def _arged_filter_os(self, giveaways, os):
         """
         Exclude giveaways what not support os
@@ -638,11 +2377,14 @@ class Harvester(Parser):
                 try:
                     if os in g.os_list:
                         filtered_giveaways.append(g)
+                except Error:
+                    raise
                 except:
                     pass
 
             return filtered_giveaways
 
+    @filter_cost(COST_LOCAL)
     def _filter_entered(self, giveaways):
         """
         Exclude giveaways that already entered
@@ -652,11 +2394,14 @@ class Harvester(Parser):
             try:
                 if not g.entered:
                     filtered_giveaways.append(g)
+            except Error:
+                raise
             except:
                 pass
 
         return filtered_giveaways
 
+    @filter_cost(COST_CACHED)
     def _filter_library(self, giveaways):
         """
         Exclude game's giveaways that already in yor library
@@ -666,11 +2411,14 @@ class Harvester(Parser):
             try:
                 if not g.in_library:
                     filtered_giveaways.append(g)
+            except Error:
+                raise
             except:
                 pass
 
         return filtered_giveaways
 
+    @filter_cost(COST_CACHED)
     def _filter_wishlist(self, giveaways):
         """
         Exclude giveaways of games that what not in you wishlist
@@ -681,11 +2429,14 @@ class Harvester(Parser):
             try:
                 if g.in_wishlist:
                     filtered_giveaways.append(g)
+            except Error:
+                raise
             except:
                 pass
 
         return filtered_giveaways
 
+    @filter_cost(COST_NETWORK)
     def _filter_dlc(self, giveaways):
         """
         Exclude dlc's giveaways
@@ -695,11 +2446,14 @@ class Harvester(Parser):
             try:
                 if not g.dlc:
                     filtered_giveaways.append(g)
+            except Error:
+                raise
             except:
                 pass
 
         return filtered_giveaways
 
+    @filter_cost(COST_NETWORK)
     def _filter_cards(self, giveaways):
         """
         Exclude giveaways games without cards
@@ -709,74 +2463,54 @@ class Harvester(Parser):
             try:
                 if g.cards:
                     filtered_giveaways.append(g)
+            except Error:
+                raise
             except:
                 pass
 
         return filtered_giveaways
 
 
-class Giveaway(Parser):
-    def __init__(self, queue, log_level, game_id):
-        super(Giveaway, self).__init__(queue, log_level)
-        self.game_id = game_id
+class Giveaway(metaclass=abc.ABCMeta):
+    __slots__ = ('harvester', 'title', 'href', 'entered', 'level', 'points', 'profile_url', 'entries', 'end_time',
+                 'cached_in_wishlist', 'cached_in_library', 'cached_os_list', 'cached_dlc', 'cached_cards')
 
-        self.steam = None
-        self.wishlist = None
-        self.library = None
+    def __init__(self, harvester, title, href, entered, level, points, profile_url, entries=None, end_time=None):
+        """
+        Giveaway parsed from listing page, all network work is done by harvester
+        :param harvester: harvester what found giveaway
+        :param entries: entries count, None if site don't show it
+        :param end_time: end timestamp, None if site don't show it
+        """
+        self.harvester = harvester
+        self.title = title
+        self.href = href
+        self.entered = entered
+        self.level = level
+        self.points = points
+        self.profile_url = profile_url
+        self.entries = entries
+        self.end_time = end_time
 
     @property
     @caching_property
     def in_wishlist(self):
-        in_wishlist = False
-
-        if self.steam is None:
-            self.steam = SteamParser(self.queue, self.log_level)
-
-        if self.wishlist is None:
-            self.wishlist = self.steam.wishlist
-
-        for game in self.wishlist:
-            if self.game_id == game["id"]:
-                in_wishlist = True
-                break
-
-        return in_wishlist
+        return self.game_id in self.harvester.steam.wishlist_ids
 
     @property
     @caching_property
     def in_library(self):
-        in_library = False
-
-        if self.steam is None:
-            self.steam = SteamParser(self.queue, self.log_level)
-
-        if self.library is None:
-            self.library = self.steam.library
-
-        for game in self.library:
-            if self.game_id == game["appid"]:
-                in_library = True
-                break
-
-        return in_library
+        return self.game_id in self.harvester.steam.library_ids
 
     @property
     @caching_property
     def os_list(self):
-        if not self.steam:
-            self.steam = SteamParser(self.queue, self.log_level)
-
-        return self.steam.get_os_list(self.game_id)
+        return self.app_info['os_list']
 
     @property
     @caching_property
     def dlc(self):
-        if not self.steam:
-            self.steam = SteamParser(self.queue, self.log_level)
-
-        app_type = self.steam.get_type(self.game_id)
-
-        if app_type == 'dlc':
+        if self.app_info['type'] == 'dlc':
             return True
         else:
             return False
@@ -784,10 +2518,11 @@ class Giveaway(Parser):
     @property
     @caching_property
     def cards(self):
-        if not self.steam:
-            self.steam = SteamParser(self.queue, self.log_level)
+        return self.app_info['cards']
 
-        return self.steam.get_cards(self.game_id)
+    @property
+    def app_info(self):
+        return self.harvester.steam.get_app_info(self.game_id)
 
     @abc.abstractmethod
     def enter(self):
@@ -804,69 +2539,100 @@ class SteamGiftsHarvester(Harvester):
     cookies = {'PHPSESSID': None}
     required_filters = ['entered', 'level', 'library']
     internal_filters = ['library', 'level', 'os', 'wishlist']
+    rows_strainer = bs4.SoupStrainer('div', {'class': ['page__heading', 'giveaway__row-outer-wrap',
+                                                       'nav__avatar-inner-wrap']})
 
     @property
     @retrying
     @caching_property
-    def level(self):
+    def account(self):
+        """
+        Account state from site main page, fetched once for level, points and xsrf_token
+        :return: {'level': int, 'points': int, 'xsrf_token': str}
+        """
         html = self.session.get(self.site_url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
-        self._login_check(html)
-        soup = bs4.BeautifulSoup(html, PARSER)
-        try:
-            return int(re.findall('\d+', soup.find('span', {'class', 'nav__points'}).nextSibling.nextSibling.text)[0])
-        except AttributeError:
-            return 0
+        return self._parse_account(html)
 
-    @property
-    @retrying
-    @caching_property
-    def points(self):
-        html = self.session.get(self.site_url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
-        self._login_check(html)
+    def _parse_account(self, html):
         soup = bs4.BeautifulSoup(html, PARSER)
+        self._login_check(soup)
 
         try:
-            return int(soup.find('span', {'class', 'nav__points'}).text)
-
-        except AttributeError:
+            points = int(soup.find('span', {'class', 'nav__points'}).text)
+            xsrf_token = soup.find('input', {'name': 'xsrf_token'})['value']
+        except (AttributeError, TypeError):
             raise ParseError
 
-    @property
-    @retrying
-    @caching_property
-    def xsrf_token(self):
-        html = self.session.get(self.site_url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
-        self._login_check(html)
-        soup = bs4.BeautifulSoup(html, PARSER)
+        try:
+            level = int(re.findall('\d+', soup.find('span', {'class', 'nav__points'}).nextSibling.nextSibling.text)[0])
+        except AttributeError:
+            level = 0
 
+        # Count of won giveaways what not marked as received
         try:
-            return soup.find('input', {'name': 'xsrf_token'})['value']
+            won = int(soup.find('a', {'href': '/giveaways/won'}).find('div', {'class': 'nav__notification'}).text)
+        except (AttributeError, ValueError):
+            won = 0
 
-        except AttributeError:
-            raise ParseError
+        return {'level': level, 'points': points, 'xsrf_token': xsrf_token, 'won': won}
+
+    @property
+    def level(self):
+        return self.account['level']
 
+    @property
+    def points(self):
+        return self.account['points']
+
+    @property
+    def xsrf_token(self):
+        return self.account['xsrf_token']
 
     @retrying
     def _get_giveaways(self, page):
         giveaways = []
 
-        self._internal_filters()
-
         url = '%s/giveaways/search' % self.site_url
         params = {'page': page}
         if 'wishlist' in self.filters:
             params.update({'type': 'wishlist'})
 
-        html = self.session.get(url, cookies=self.cookies, params=params, headers={'User-Agent': USER_AGENT}).content
-        self._login_check(html)
-        soup = bs4.BeautifulSoup(html, PARSER)
-        items = soup.find('div', {'class': 'page__heading'}).next_sibling.next_sibling.find_all('div', {'class': 'giveaway__row-outer-wrap'})
-        if not items:
+        if PARSER == "lxml":
+            html = self.session.get(url, cookies=self.cookies, params=params, headers={'User-Agent': USER_AGENT}).content
+            tree = lxml.html.document_fromstring(html)
+            self._login_check(tree)
+            rows = self._parse_rows_lxml(tree)
+        else:
+            soup = self._get_page(url, self.rows_strainer, params=params)
+            rows = self._parse_rows_soup(soup)
+
+        if not rows:
             raise NoItemsError
 
-        for item in items:
+        for row in rows:
+            giveaway = SteamGiftsGiveaway(self, row['game_id'], row['code'], row['title'], row['href'], row['entered'],
+                                          row['level'], row['points'], row['profile_url'], row['entries'],
+                                          row['end_time'])
+
+            giveaways.append(giveaway)
+
+        return giveaways
+
+    @classmethod
+    def _parse_rows_soup(cls, soup):
+        """
+        Parse giveaways rows
+        :param soup: giveaways list page, may be parsed with rows_strainer
+        :return: list of rows data
+        """
+        heading = soup.find('div', {'class': 'page__heading'})
+        if heading is None:
+            raise ParseError
+
+        rows = []
+        for item in heading.find_all_next('div', {'class': 'giveaway__row-outer-wrap'}):
             header = item.find('a', {'class': 'giveaway__heading__name'})
-            href = "%s%s" % (self.site_url, header['href'])
+            href = "%s%s" % (cls.site_url, header['href'])
 
             title = header.text.strip()
 
@@ -889,22 +2655,88 @@ class SteamGiftsHarvester(Harvester):
             except TypeError:
                 game_id = None
 
-            profile_url = "%s%s" % (self.site_url, item.find('a', {'class': 'giveaway__username'})['href'])
+            profile_url = "%s%s" % (cls.site_url, item.find('a', {'class': 'giveaway__username'})['href'])
 
-            giveaway = SteamGiftsGiveaway(self.queue, self.log_level, game_id, self.xsrf_token, code, title, href, entered, level, points, profile_url)
+            # First timestamp is end time, second is creation time
+            try:
+                end_time = int(item.find('span', {'data-timestamp': True})['data-timestamp'])
+            except TypeError:
+                end_time = None
 
-            giveaways.append(giveaway)
+            try:
+                entries = int(re.findall('[\d,]+', item.find('div', {'class': 'giveaway__links'}).a.text)[0]
+                              .replace(',', ''))
+            except (AttributeError, IndexError):
+                entries = None
 
-        return giveaways
+            rows.append({'game_id': game_id, 'code': code, 'title': title, 'href': href, 'entered': entered,
+                         'level': level, 'points': points, 'profile_url': profile_url, 'entries': entries,
+                         'end_time': end_time})
+
+        return rows
+
+    @classmethod
+    def _parse_rows_lxml(cls, tree):
+        """
+        Same as _parse_rows_soup, but for lxml tree
+        """
+        heading = tree.xpath("//div[%s]" % xpath_class('page__heading'))
+        if not heading:
+            raise ParseError
+
+        rows = []
+        for item in heading[0].xpath("following::div[%s]" % xpath_class('giveaway__row-outer-wrap')):
+            header = item.xpath(".//a[%s]" % xpath_class('giveaway__heading__name'))[0]
+            href = "%s%s" % (cls.site_url, header.get('href'))
+
+            title = header.text_content().strip()
+
+            code = str.split(header.get('href'), '/')[2]
+
+            entered = bool(item.xpath(".//div[%s]" % xpath_class('is-faded')))
+
+            level = item.xpath(".//div[@title='Contributor Level']")
+            if level:
+                level = int(re.findall('\d+', level[0].text_content())[0])
+            else:
+                level = 0
+
+            points = item.xpath(".//span[%s]" % xpath_class('giveaway__heading__thin'))[0]
+            points = int(re.findall('\d+', points.text_content())[0])
+
+            game_id = item.xpath(".//h2[%s]//a[%s][@target='_blank']/@href" % (xpath_class('giveaway__heading'),
+                                                                              xpath_class('giveaway__icon')))
+            if game_id:
+                game_id = int(str.split(game_id[0], '/')[4])
+            else:
+                game_id = None
+
+            profile_url = "%s%s" % (cls.site_url, item.xpath(".//a[%s]/@href" % xpath_class('giveaway__username'))[0])
+
+            end_time = item.xpath(".//span[@data-timestamp]/@data-timestamp")
+            if end_time:
+                end_time = int(end_time[0])
+            else:
+                end_time = None
+
+            entries = item.xpath(".//div[%s]/a[1]" % xpath_class('giveaway__links'))
+            try:
+                entries = int(re.findall('[\d,]+', entries[0].text_content())[0].replace(',', ''))
+            except IndexError:
+                entries = None
+
+            rows.append({'game_id': game_id, 'code': code, 'title': title, 'href': href, 'entered': entered,
+                         'level': level, 'points': points, 'profile_url': profile_url, 'entries': entries,
+                         'end_time': end_time})
+
+        return rows
 
     @retrying
     def _reap(self):
         giveaways_win = []
 
         url = '%s/giveaways/won' % self.site_url
-        html = self.session.get(url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
-        self._login_check(html)
-        soup = bs4.BeautifulSoup(html, PARSER)
+        soup = self._get_page(url)
         items = soup.find('div', {'class': 'table__rows'}).find_all('div', {'class': 'table__row-outer-wrap'})
         if not items:
             raise NoItemsError
@@ -923,6 +2755,39 @@ class SteamGiftsHarvester(Harvester):
 
         return giveaways_win
 
+    def _reap_fingerprint(self):
+        return self.account['won']
+
+    @retrying
+    def _prepare(self):
+        """
+        Apply internal filters in account giveaways settings, if they not applied yet
+        """
+        settings = self._internal_filters()
+
+        url = "%s/account/settings/giveaways" % self.site_url
+        html = self.session.get(url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
+        current_settings = self._parse_settings(html)
+
+        if all(current_settings.get(key) == str(value) for key, value in settings.items()):
+            self.log.debug("Account settings already applied.")
+            return
+
+        data = {'xsrf_token': self.xsrf_token}
+        data.update(settings)
+        self.session.post(url, cookies=self.cookies, data=data, headers={'User-Agent': USER_AGENT})
+        self.log.debug("Account settings applied.")
+
+    def _parse_settings(self, html):
+        soup = bs4.BeautifulSoup(html, PARSER)
+        self._login_check(soup)
+
+        settings = {}
+        for field in soup.find_all('input', {'name': re.compile('^filter_')}):
+            settings[field['name']] = field.get('value')
+
+        return settings
+
     def _internal_filters(self):
         if ['os', 'win'] in self.filters:
             filter_os = 1
@@ -937,40 +2802,13 @@ class SteamGiftsHarvester(Harvester):
         filter_giveaways_level = 1
         filter_giveaways_missing_base_game = 1
 
-        data = {'xsrf_token': self.xsrf_token, 'filter_os': filter_os,
+        return {'filter_os': filter_os,
                 'filter_giveaways_exist_in_account': filter_giveaways_exist_in_account,
                 'filter_giveaways_level': filter_giveaways_level,
                 'filter_giveaways_missing_base_game': filter_giveaways_missing_base_game}
 
-        url = "%s/account/settings/giveaways" % self.site_url
-        self.session.post(url, cookies=self.cookies, data=data,
-                                 headers={'User-Agent': USER_AGENT}).status_code
-
-
-class SteamGiftsGiveaway(Giveaway):
-    name = "SteamGifts"
-    verbose_name = "«Steam Gifts»"
-    site_url = "https://www.steamgifts.com"
-    check_tag = "div"
-    check_type = "class"
-    check_text = "nav__avatar-inner-wrap"
-    cookies = {'PHPSESSID': None}
-
-    def __init__(self, queue, log_level, game_id,  xsrf_token, code, title, href, entered, level, points, profile_url):
-        super(SteamGiftsGiveaway, self).__init__(queue, log_level, game_id)
-        self.xsrf_token = xsrf_token
-        self.code = code
-        self.title = title
-        self.href = href
-        self.entered = entered
-        self.level = level
-        self.points = points
-        self.profile_url = profile_url
-
-    @property
-    @caching_property
-    def trust_points(self):
-        html = self.session.get(self.profile_url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
+    def _fetch_trust_points(self, profile_url):
+        html = self.session.get(profile_url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
 
         soup = bs4.BeautifulSoup(html, PARSER)
         gift_sent_row = soup.find('span', {'title': re.compile('\d+ Awaiting Feedback, \d+ Not Received')})
@@ -981,18 +2819,51 @@ class SteamGiftsGiveaway(Giveaway):
 
         return trust_points
 
-    def enter(self):
-        data = {'xsrf_token': self.xsrf_token, 'do': 'entry_insert', 'code': self.code}
+    def _enter(self, giveaway):
+        data = {'xsrf_token': self.xsrf_token, 'do': 'entry_insert', 'code': giveaway.code}
 
         url = "%s/ajax.php" % self.site_url
-        code = self.session.post(url, cookies=self.cookies, data=data, headers={'User-Agent': USER_AGENT}).status_code
+        response = self.session.post(url, cookies=self.cookies, data=data, headers={'User-Agent': USER_AGENT})
+
+        try:
+            result = response.json()
+        except ValueError:
+            result = {}
+
+        if result.get('type') == 'success' and 'points' in result:
+            self.account['points'] = int(result['points'])
+        else:
+            # Unexpected answer, account state must be fetched again
+            try:
+                del self.cached_account
+            except AttributeError:
+                pass
 
-        if code == 200:
+        if response.status_code == 200:
             return 'ok'
         else:
             return 'error'
 
 
+class SteamGiftsGiveaway(Giveaway):
+    __slots__ = ('game_id', 'code', 'cached_trust_points')
+
+    def __init__(self, harvester, game_id, code, title, href, entered, level, points, profile_url, entries=None,
+                 end_time=None):
+        super(SteamGiftsGiveaway, self).__init__(harvester, title, href, entered, level, points, profile_url, entries,
+                                                 end_time)
+        self.game_id = game_id
+        self.code = code
+
+    @property
+    @caching_property
+    def trust_points(self):
+        return self.harvester._get_trust_points(self.profile_url)
+
+    def enter(self):
+        return self.harvester._enter(self)
+
+
 # TODO incapsula bypass
 class IndieGalaHarvester(Harvester):
     name = "IndieGala"
@@ -1003,6 +2874,22 @@ class IndieGalaHarvester(Harvester):
     check_text = "account-email"
     cookies = {'auth': None, 'incap_ses_586_255598': None}
     required_filters = ['entered', 'level']
+    rows_strainer = bs4.SoupStrainer(['div', 'span'], {'class': ['tickets-row', 'account-email']})
+
+    @classmethod
+    def steam_lists(cls, config):
+        # Library checked on giveaway page
+        return super().steam_lists(config) - {'library'}
+
+    @filter_cost(COST_NETWORK)
+    def _filter_library(self, giveaways):
+        # Giveaway page requested for each giveaway
+        return super(IndieGalaHarvester, self)._filter_library(giveaways)
+
+    @filter_cost(COST_NETWORK)
+    def _filter_wishlist(self, giveaways):
+        # Game id taken from giveaway page
+        return super(IndieGalaHarvester, self)._filter_wishlist(giveaways)
 
     @property
     @retrying
@@ -1020,9 +2907,7 @@ class IndieGalaHarvester(Harvester):
     @retrying
     @caching_property
     def points(self):
-        html = self.session.get(self.site_url, headers={'User-Agent': USER_AGENT}).content
-        self._login_check(html)
-        soup = bs4.BeautifulSoup(html, PARSER)
+        soup = self._get_page(self.site_url)
         try:
             return int(soup.find('span', {'id': 'silver-coins-menu'}).text)
         except AttributeError:
@@ -1032,16 +2917,44 @@ class IndieGalaHarvester(Harvester):
     def _get_giveaways(self, page):
         giveaways = []
         url = '%s/%s' % (self.site_url, page)
-        html = self.session.get(url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
-        self._login_check(html)
-        soup = bs4.BeautifulSoup(html, PARSER)
-        items = soup.find('div', {'class': 'tickets-row'}).find_all('div', {'class': 'tickets-col'})
-        if not items:
+        if PARSER == "lxml":
+            html = self.session.get(url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
+            tree = lxml.html.document_fromstring(html)
+            self._login_check(tree)
+            rows = self._parse_rows_lxml(tree)
+        else:
+            soup = self._get_page(url, self.rows_strainer)
+            rows = self._parse_rows_soup(soup)
+
+        if not rows:
             raise NoItemsError
 
-        for item in items:
+        for row in rows:
+            giveaway = IndieGalaGiveaway(self, row['giveaway_id'], row['title'], row['href'], row['entered'],
+                                         row['level'], row['points'], row['profile_url'])
+
+            if row['guaranteed']:
+                giveaway.preload_trust_points = 100
+
+            giveaways.append(giveaway)
+
+        return giveaways
+
+    @classmethod
+    def _parse_rows_soup(cls, soup):
+        """
+        Parse giveaways rows
+        :param soup: giveaways list page, may be parsed with rows_strainer
+        :return: list of rows data
+        """
+        tickets = soup.find('div', {'class': 'tickets-row'})
+        if tickets is None:
+            raise ParseError
+
+        rows = []
+        for item in tickets.find_all('div', {'class': 'tickets-col'}):
             header = item.find('div', {'class': 'box_pad_5'}).h2.a
-            href = "%s%s" % (self.site_url, str.replace(header['href'], '/giveaways', '', 1))
+            href = "%s%s" % (cls.site_url, str.replace(header['href'], '/giveaways', '', 1))
             title = header['title']
 
             giveaway_id = item.find('div', {'class': 'ticket-right'}).div['rel']
@@ -1051,58 +2964,140 @@ class IndieGalaHarvester(Harvester):
             else:
                 entered = True
 
-            level = int(re.findall('\d+', item.find('div', {'class': 'type-level-cont'}).text.strip())[0])
+            level_text = item.find('div', {'class': 'type-level-cont'}).text
+            level = int(re.findall('\d+', level_text.strip())[0])
 
             points = int(item.find('div', {'class': 'ticket-price'}).strong.text.strip())
 
             creater = item.find('div', {'class': 'steamnick'}).a
 
-            profile_url = "%s%s" % (str.replace(self.site_url, '/giveaways', '', 1), creater['href'])
+            profile_url = "%s%s" % (str.replace(cls.site_url, '/giveaways', '', 1), creater['href'])
 
-            giveaway = IndieGalaGiveaway(self.queue, self.log_level, giveaway_id, title, href, entered, level, points, profile_url)
+            rows.append({'giveaway_id': giveaway_id, 'title': title, 'href': href, 'entered': entered,
+                         'level': level, 'points': points, 'profile_url': profile_url,
+                         'guaranteed': 'not guaranteed' not in level_text})
 
-            if 'not guaranteed' not in item.find('div', {'class': 'type-level-cont'}).text:
-                giveaway.preload_trust_points = 100
+        return rows
 
-            giveaways.append(giveaway)
+    @classmethod
+    def _parse_rows_lxml(cls, tree):
+        """
+        Same as _parse_rows_soup, but for lxml tree
+        """
+        tickets = tree.xpath("//div[%s]" % xpath_class('tickets-row'))
+        if not tickets:
+            raise ParseError
 
-        return giveaways
+        rows = []
+        for item in tickets[0].xpath(".//div[%s]" % xpath_class('tickets-col')):
+            header = item.xpath("(.//div[%s])[1]/descendant::h2[1]/descendant::a[1]" % xpath_class('box_pad_5'))[0]
+            href = "%s%s" % (cls.site_url, str.replace(header.get('href'), '/giveaways', '', 1))
+            title = header.get('title')
+
+            giveaway_id = item.xpath("(.//div[%s])[1]/descendant::div[1]/@rel" % xpath_class('ticket-right'))[0]
+
+            entered = not item.xpath(".//aside[%s]" % xpath_class('giv-coupon'))
+
+            level_text = item.xpath(".//div[%s]" % xpath_class('type-level-cont'))[0].text_content()
+            level = int(re.findall('\d+', level_text.strip())[0])
+
+            points = item.xpath("(.//div[%s])[1]/descendant::strong[1]" % xpath_class('ticket-price'))[0]
+            points = int(points.text_content().strip())
+
+            creater = item.xpath("(.//div[%s])[1]/descendant::a[1]/@href" % xpath_class('steamnick'))[0]
+
+            profile_url = "%s%s" % (str.replace(cls.site_url, '/giveaways', '', 1), creater)
+
+            rows.append({'giveaway_id': giveaway_id, 'title': title, 'href': href, 'entered': entered,
+                         'level': level, 'points': points, 'profile_url': profile_url,
+                         'guaranteed': 'not guaranteed' not in level_text})
+
+        return rows
 
     @retrying
     def _reap(self):
-        reap = True
+        try:
+            workers = int(self.config['reap_workers'])
+        except KeyError:
+            workers = 4
+
+        try:
+            delay = min_delay = float(self.config['reap_poll'])
+        except KeyError:
+            delay = min_delay = 1
+
         url = '%s/library_completed' % self.site_url
-        while reap:
-            data = self.session.get(url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
-            try:
-                html = json.loads(data)['html']
-                soup = bs4.BeautifulSoup(html, PARSER)
-                items = soup.find('ul', {'class': 'giveaways-completed-list-to-check'}).find_all('li')
-            except json.decoder.JSONDecodeError:
-                raise ReapError
-            except IndexError:
-                raise ReapError
+        soup = self._get_completed(url)
+        entry_ids = self._parse_to_check(soup)
+        # Not checked entries are rechecked, but not forever
+        polls = 0
+        while entry_ids and polls < 10:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(self._check_if_won, entry_ids))
+
+            time.sleep(delay)
+            polls += 1
+
+            soup = self._get_completed(url)
+            left = self._parse_to_check(soup)
+            if len(left) < len(entry_ids):
+                delay = min_delay
+            else:
+                # Site didn't process checks yet, wait longer
+                delay = min(delay * 2, 60)
+            entry_ids = left
 
-            for item in items:
-                if "No results." in item.text:
-                    reap = False
-                    break
-                else:
-                    r_url = '%s/check_if_won' % self.site_url
-                    entry_id = item.find('input', {'name': 'entry_id'})['value']
-                    data = {'entry_id': entry_id}
-                    self.session.post(r_url, cookies=self.cookies, data=json.dumps(data), headers={'User-Agent': USER_AGENT})
+        if entry_ids:
+            self.log.warning("%s didn't check %s completed giveaways, will try next time." % (self.verbose_name,
+                                                                                             len(entry_ids)))
 
-            time.sleep(15)
+        return self._parse_won(soup)
 
-        giveaways_win = []
+    def _get_completed(self, url):
+        """
+        :param url: completed giveaways url
+        :return: parsed html from json answer
+        """
         data = self.session.get(url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
         try:
             html = json.loads(data)['html']
-            soup = bs4.BeautifulSoup(html, PARSER)
-            items = soup.find_all('ul', {'class': 'giveaways-completed-list'})[1].find_all('li')
-        except json.decoder.JSONDecodeError:
+        except (json.decoder.JSONDecodeError, KeyError, TypeError):
+            raise ReapError
+
+        return bs4.BeautifulSoup(html, PARSER)
+
+    @staticmethod
+    def _parse_to_check(soup):
+        """
+        :param soup: completed giveaways
+        :return: entry ids of completed giveaways what not checked for win
+        """
+        try:
+            items = soup.find('ul', {'class': 'giveaways-completed-list-to-check'}).find_all('li')
+        except AttributeError:
             raise ReapError
+
+        entry_ids = []
+        for item in items:
+            if "No results." in item.text:
+                break
+            entry_ids.append(item.find('input', {'name': 'entry_id'})['value'])
+
+        return entry_ids
+
+    def _check_if_won(self, entry_id):
+        url = '%s/check_if_won' % self.site_url
+        data = {'entry_id': entry_id}
+        self.session.post(url, cookies=self.cookies, data=json.dumps(data), headers={'User-Agent': USER_AGENT})
+
+    def _parse_won(self, soup):
+        """
+        :param soup: completed giveaways
+        :return: won giveaways what wait for feedback
+        """
+        giveaways_win = []
+        try:
+            items = soup.find_all('ul', {'class': 'giveaways-completed-list'})[1].find_all('li')
         except IndexError:
             raise ReapError
 
@@ -1119,37 +3114,9 @@ class IndieGalaHarvester(Harvester):
 
         return giveaways_win
 
-
-class IndieGalaGiveaway(Giveaway):
-    name = "IndieGala"
-    verbose_name = "«Indie Gala»"
-    site_url = "https://www.indiegala.com/giveaways"
-    check_tag = "span"
-    check_type = "class"
-    check_text = "account-email"
-    cookies = {'auth': None, 'incap_ses_586_255598': None}
-
-    def __init__(self, queue, log_level, giveaway_id, title, href, entered, level, points, profile_url):
-        super(Giveaway, self).__init__(queue, log_level)
-        self.giveaway_id = giveaway_id
-        self.title = title
-        self.href = href
-        self.entered = entered
-        self.level = level
-        self.points = points
-        self.profile_url = profile_url
-
-        self.steam = None
-        self.wishlist = None
-        self.library = None
-
-    @property
     @retrying
-    @caching_property
-    def trust_points(self):
-        html = self.session.get(self.profile_url, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
-        self._login_check(html)
-        soup = bs4.BeautifulSoup(html, PARSER)
+    def _fetch_trust_points(self, profile_url):
+        soup = self._get_page(profile_url)
         try:
             positive = int(soup.find('span', {'title': 'Positive feedbacks'}).text)
             negative = int(soup.find('span', {'title': 'Negative feedbacks'}).text)
@@ -1157,13 +3124,9 @@ class IndieGalaGiveaway(Giveaway):
         except AttributeError:
             return -1
 
-    @property
     @retrying
-    @caching_property
-    def in_library(self):
-        html = self.session.get(self.href, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
-        self._login_check(html)
-        soup = bs4.BeautifulSoup(html, PARSER)
+    def _get_in_library(self, href):
+        soup = self._get_page(href)
         ticket = soup.find('section', {'class': 'ticket-cont'})
         if ticket:
             if ticket.find('div', {'class': 'on-steam-library-corner'}):
@@ -1173,34 +3136,256 @@ class IndieGalaGiveaway(Giveaway):
         else:
             raise Error
 
-    @property
     @retrying
-    @caching_property
-    def game_id(self):
-        html = self.session.get(self.href, cookies=self.cookies, headers={'User-Agent': USER_AGENT}).content
-        self._login_check(html)
-        soup = bs4.BeautifulSoup(html, PARSER)
+    def _get_game_id(self, href):
+        soup = self._get_page(href)
         game_id = int(str.split(soup.find('a', {'class': 'steam-link'})['href'], '/')[4])
         return game_id
 
-    def enter(self):
+    def _enter(self, giveaway):
         url = '%s/new_entry' % self.site_url
 
-        data = {'giv_id': self.giveaway_id, 'ticket_price': self.points}
+        data = {'giv_id': giveaway.giveaway_id, 'ticket_price': giveaway.points}
 
         data = self.session.post(url, cookies=self.cookies, data=json.dumps(data), headers={'User-Agent': USER_AGENT}).json()
 
         return data['status']
 
 
-def spawner(name, queue, log_level):
-    if name == "SteamGifts":
-        harvester = SteamGiftsHarvester(queue, log_level)
-        harvester.start()
+class IndieGalaGiveaway(Giveaway):
+    __slots__ = ('giveaway_id', 'preload_trust_points', 'cached_trust_points', 'cached_game_id')
+
+    def __init__(self, harvester, giveaway_id, title, href, entered, level, points, profile_url):
+        super(IndieGalaGiveaway, self).__init__(harvester, title, href, entered, level, points, profile_url)
+        self.giveaway_id = giveaway_id
+
+    @property
+    @caching_property
+    def trust_points(self):
+        return self.harvester._get_trust_points(self.profile_url)
+
+    @property
+    @caching_property
+    def in_library(self):
+        return self.harvester._get_in_library(self.href)
+
+    @property
+    @caching_property
+    def game_id(self):
+        return self.harvester._get_game_id(self.href)
+
+    def enter(self):
+        return self.harvester._enter(self)
+
+
+HARVESTERS = {"SteamGifts": SteamGiftsHarvester, "IndieGala": IndieGalaHarvester}
+
+
+# Harvester name and harvester of this process, kept between harvests
+_harvesters = {}
+
+
+def spawner(name, queue, log_level, config, steam_data=None):
+    """
+    Harvest in other process with config and Steam lists of main process
+    :param name: harvester name
+    :param queue: Channel for results
+    :param config: config snapshot
+    :param steam_data: Steam lists fetched by main process
+    """
+    apply_config(config)
+
+    steam = prepare_steam(queue, log_level)
+    if steam_data:
+        steam.preload(steam_data)
+
+    harvest(_harvesters, name, queue, log_level)
+
+
+def apply_config(config):
+    """
+    Use config snapshot of main process in other process
+    :param config: config snapshot
+    """
+    set_config(config)
+    if get_config()['main'].get('USER_AGENT'):
+        global USER_AGENT
+        USER_AGENT = get_config()['main']['USER_AGENT']
+
+
+def init_worker(config):
+    """
+    Setup of long lived worker process, same for harvester and Steam workers
+    :param config: config snapshot of main process
+    """
+    global DEDICATED_WORKER
+    DEDICATED_WORKER = True
+    apply_config(config)
+
+
+def prepare_steam(queue, log_level):
+    """
+    Steam parser for new harvest, made again if its config section changed
+    :param queue: queue for error messages of new harvest
+    :return: SteamParser
+    """
+    steam = SteamParser(queue, log_level)
+    if get_config()['Steam'] != steam.config:
+        SteamParser.drop()
+        steam = SteamParser(queue, log_level)
+
+    steam.reset(queue)
+    return steam
+
+
+def get_harvester(harvesters, name, queue, log_level):
+    """
+    Harvester of previous harvest, new one made if none or its config changed
+    :param harvesters: dict of harvester name and harvester, updated in place
+    :param name: harvester name
+    :param queue: queue for results
+    :return: harvester ready for harvest
+    """
+    harvester = harvesters.get(name)
+    if harvester is None or get_config()[harvester.name] != harvester.config:
+        harvester = harvesters[name] = HARVESTERS[name](queue, log_level)
+    else:
+        harvester.reset(queue)
+
+    return harvester
+
+
+def report_failure(name, queue, e):
+    """
+    Send failure of harvester to bot
+    :param name: harvester name
+    :param queue: queue for results
+    :param e: exception what stopped harvester
+    """
+    if isinstance(e, Error):
+        # Already logged by _crash
+        msg = str(e)
+    else:
+        msg = repr(e)
+        logging.getLogger(name).error("%s harvester failed: %s" % (name, msg))
+
+    queue.put({'timestamp': datetime.now(), 'status': 'error', 'msg': msg})
+
+
+def harvest(harvesters, name, queue, log_level):
+    """
+    Harvest with harvester of previous harvest, new one made if none or its config changed
+    :param harvesters: dict of harvester name and harvester, updated in place
+    :param name: harvester name
+    :param queue: queue for results
+    """
+    try:
+        get_harvester(harvesters, name, queue, log_level).start()
+    except Exception as e:
+        report_failure(name, queue, e)
+
+
+def worker_spawner(name, commands, queue, log_level, config):
+    """
+    Long lived harvester process, keeps session and caches between harvests
+    :param name: harvester name
+    :param commands: queue of commands from bot, ('harvest', config, steam_data) or ('stop', )
+    :param queue: queue for results
+    """
+    init_worker(config)
+
+    while True:
+        command = commands.get()
+        if command[0] == 'stop':
+            break
+
+        spawner(name, queue, log_level, *command[1:])
+
+
+def async_spawner(names, queues, log_level, lists, harvesters=None):
+    """
+    Run harvesters in one event loop of current process
+    :param names: names of harvesters
+    :param queues: dict of harvester name and queue for results
+    :param lists: Steam lists used by harvesters
+    :param harvesters: dict of harvester name and harvester kept from previous run, updated in place
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    config = get_config()
+    steam = prepare_steam(Queue(), log_level)
+
+    limits = {}
+    for site_url, section in [(steam.site_url, 'Steam'), (steam.store_url, 'Steam')] + \
+                             [(HARVESTERS[name].site_url, name) for name in names]:
+        limits[urllib.parse.urlsplit(site_url).hostname] = int(config[section].get('host_limit', 4))
+
+    runner = AsyncRunner(loop, limits)
+    if harvesters is None:
+        harvesters = {}
+    running = {}
+    for name in names:
+        try:
+            running[name] = get_harvester(harvesters, name, queues[name], log_level)
+        except Exception as e:
+            report_failure(name, queues[name], e)
+
+    async def harvest():
+        jobs = [runner.run(steam.site_url, getattr, steam, '%s_ids' % name) for name in lists]
+        for result in await asyncio.gather(*jobs, return_exceptions=True):
+            if isinstance(result, Exception):
+                steam.log.warning("Can't fetch Steam lists, harvesters will fetch it itself.")
+
+        results = await asyncio.gather(*[harvester.async_start(runner) for harvester in running.values()],
+                                       return_exceptions=True)
+        for name, result in zip(running, results):
+            if isinstance(result, Exception):
+                report_failure(name, queues[name], result)
+
+    try:
+        loop.run_until_complete(harvest())
+    finally:
+        runner.close()
+        loop.close()
+
+
+def steam_spawner(commands, queue, log_level, config):
+    """
+    Long lived process what fetch Steam lists for harvesters, keeps Steam session between harvests
+    :param commands: queue of commands from bot, ('fetch', config, lists) or ('stop', )
+    :param queue: Channel for results
+    :param config: config snapshot of main process
+    """
+    init_worker(config)
+
+    while True:
+        command = commands.get()
+        if command[0] == 'stop':
+            break
+
+        config, lists = command[1:]
+        apply_config(config)
+        steam = prepare_steam(queue, log_level)
+
+        try:
+            steam_data = {}
+            if 'wishlist' in lists:
+                steam_data['wishlist_ids'] = steam.wishlist_ids
+            if 'library' in lists:
+                steam_data['library_ids'] = steam.library_ids
+        except Exception as e:
+            if isinstance(e, Error):
+                # Already logged by _crash
+                msg = str(e)
+            else:
+                msg = repr(e)
+                steam.log.error("Can't fetch Steam lists: %s" % msg)
+            queue.put({'timestamp': datetime.now(), 'status': 'error', 'msg': msg})
+            continue
 
-    elif name == "IndieGala":
-        harvester = IndieGalaHarvester(queue, log_level)
-        harvester.start()
+        results = {'timestamp': datetime.now(), 'status': 'ok', 'steam': steam_data}
+        queue.put(results)
 
 
 # def cookiejar_from_dict(cookie_dict, cj, overwrite=True, **kwargs):
@@ -1243,46 +3428,49 @@ def main():
 
     log.info("WELCOME TO GIVEAWAY BOT REBORN!!!")
 
-    config = configparser.ConfigParser()
     try:
-        config.read_file(open("giveaway_bot.ini"))
+        load_config()
     except FileNotFoundError:
         log.error("No config file. Please copy «giveaway_bot.exp» as «giveaway_bot.ini» and edit it.")
         sys.exit()
+    except ConfigError as e:
+        log.error(e)
+        sys.exit()
 
-    config = config['main']
+    bot = GiveawayBot(log_level)
+    while True:
+        try:
+            config = load_config()['main']
+        except (FileNotFoundError, ConfigError) as e:
+            log.error("Can't reload config, use previous. %s" % e)
+            config = get_config()['main']
 
-    if config['USER_AGENT']:
-        global USER_AGENT
-        USER_AGENT = config['USER_AGENT']
+        if config.get('USER_AGENT'):
+            global USER_AGENT
+            USER_AGENT = config['USER_AGENT']
 
-    while True:
-        bot = GiveawayBot(log_level)
         try:
-            bot.start()
-            for i in range(int(config['sleepTime'])):
-                processes_logs = bot.processes_logs
-                for key in processes_logs:
-                    queue = bot.processes_logs[key]
-                    while not queue.empty():
-                        results = queue.get()
-                        if results['status'] == "ok":
-                            if len(results['reap']) > 0:
-                                log.info(
-                                    '[%(timestamp)s] %(key)s Harvester end work takes part in %(num)s giveaways, and YOU WIN something!' %
-                                    {'timestamp': results['timestamp'].strftime("%Y-%m-%d %H:%M:%S"), 'key': key,
-                                     'num': len(results['sow'])})
-                            else:
-                                log.info(
-                                    "[%(timestamp)s] %(key)s Harvester end work: takes part in %(num)s giveaways, and you don't win anything. For now..." %
-                                    {'timestamp': results['timestamp'].strftime("%Y-%m-%d %H:%M:%S"), 'key': key,
-                                     'num': len(results['sow'])})
-
-                        elif results['status'] == "error":
-                            log.error('[%(timestamp)s] %(key)s Harvester end work with error' %
-                                      {'timestamp': results['timestamp'].strftime("%Y-%m-%d %H:%M:%S"), 'key': key})
-
-                time.sleep(60)
+            pending = set(bot.start())
+            deadline = time.monotonic() + bot.harvest_timeout
+            finished = None
+            while True:
+                if pending:
+                    # Harvesters what hang are given up after harvest_timeout
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        for key, results in bot.abort(pending):
+                            report_results(log, key, results)
+                        continue
+                else:
+                    # Next harvest sleepTime minutes after last harvester finished
+                    if finished is None:
+                        finished = time.monotonic()
+                    timeout = finished + int(config['sleepTime']) * 60 - time.monotonic()
+                    if timeout <= 0:
+                        break
+
+                for key, results in bot.collect(pending, timeout):
+                    report_results(log, key, results)
 
         except KeyboardInterrupt:
             log.info("Interrupted by user.")
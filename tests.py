@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 
 import unittest
+import asyncio
 import multiprocessing
 import random
 import logging
 import os
+import tempfile
+import time
+from queue import Queue
 
 import giveaway_bot
 
@@ -18,6 +22,26 @@ except KeyError:
     TRAVIS_BUILD = False
 giveaway_bot.TRAVIS_BUILD = TRAVIS_BUILD
 
+cache_dir = None
+
+
+def setUpModule():
+    # Apps, authors and reap state of tests are not mixed with real ones
+    global cache_dir
+    cache_dir = tempfile.TemporaryDirectory()
+    try:
+        config = giveaway_bot.load_config()
+    except FileNotFoundError:
+        return
+
+    cache = dict(config.get('Cache', {}), file=os.path.join(cache_dir.name, 'giveaway_bot.cache'))
+    giveaway_bot.set_config(dict(config, Cache=giveaway_bot.ConfigSection(cache)))
+
+
+def tearDownModule():
+    cache_dir.cleanup()
+
+
 class DecoratorsTestCase(unittest.TestCase):
     def test_caching_property(self):
         class CachingTest:
@@ -74,7 +98,282 @@ class DecoratorsTestCase(unittest.TestCase):
             two.fn()
             self.assertEqual(len(log.output), 3)
 
-        # TODO timeout test
+    def test_retry_policy(self):
+        policy = giveaway_bot.RetryPolicy(retries=5, delay=1, backoff=2, max_delay=3, jitter=0)
+        self.assertEqual([policy.get_delay(attempt) for attempt in range(4)], [1, 2, 3, 3])
+        self.assertEqual(policy.get_delay(0, retry_after=10), 10)
+
+        policy.jitter = 0.5
+        for attempt in range(4):
+            self.assertTrue(0.5 <= policy.get_delay(0) <= 1)
+
+        policy = giveaway_bot.RetryPolicy(retries=1)
+        started = time.monotonic()
+        self.assertTrue(policy.wait(0, started))
+        self.assertFalse(policy.wait(1, started))
+
+        policy = giveaway_bot.RetryPolicy(retries=5, delay=10, max_time=5)
+        self.assertFalse(policy.wait(0, time.monotonic()))
+
+        # Too long Retry-After is not waited
+        policy = giveaway_bot.RetryPolicy(retries=5, max_delay=60)
+        started = time.monotonic()
+        self.assertFalse(policy.wait(0, started, retry_after=3600))
+        self.assertLess(time.monotonic() - started, 1)
+
+        config = {'retry': '3', 'timeout': '2', 'retry_backoff': '3'}
+        policy = giveaway_bot.RetryPolicy.from_config(config)
+        self.assertEqual((policy.retries, policy.delay, policy.backoff, policy.max_time), (3, 2, 3, 0))
+
+    def test_retry_after(self):
+        self.assertEqual(giveaway_bot.parse_retry_after('120'), 120)
+        self.assertIsNone(giveaway_bot.parse_retry_after(None))
+        self.assertIsNone(giveaway_bot.parse_retry_after('soon'))
+        self.assertEqual(giveaway_bot.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+
+        response = giveaway_bot.requests.Response()
+        response.status_code = 429
+        response.headers['Retry-After'] = '0'
+        with self.assertRaises(giveaway_bot.RateLimitError) as error:
+            giveaway_bot.rate_limit_hook(response)
+        self.assertEqual(error.exception.retry_after, 0)
+
+        response.status_code = 200
+        giveaway_bot.rate_limit_hook(response)
+
+        class RateLimitTest:
+            config = {'retry': 2, 'timeout': 100}
+            calls = 0
+
+            @giveaway_bot.retrying
+            def fn(self):
+                self.calls += 1
+                if self.calls < 3:
+                    raise giveaway_bot.RateLimitError('http://example.com/', retry_after=0)
+                return 'ok'
+
+        # Retry-After used instead of long timeout
+        obj = RateLimitTest()
+        self.assertEqual(obj.fn(), 'ok')
+        self.assertEqual(obj.calls, 3)
+
+
+class ConfigTestCase(unittest.TestCase):
+    def test_load_config(self):
+        config = giveaway_bot.load_config()
+        self.assertIs(giveaway_bot.load_config(), config)
+        self.assertIs(giveaway_bot.get_config(), config)
+        self.assertIn('SteamGifts', config)
+
+    def test_load_broken_config(self):
+        previous = giveaway_bot.get_config()
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as path:
+            os.chdir(path)
+            self.addCleanup(os.chdir, cwd)
+            with open('giveaway_bot.exp', 'w') as config_file:
+                config_file.write('sleepTime: 10\n')
+
+            with self.assertRaises(giveaway_bot.ConfigError):
+                giveaway_bot.load_config()
+
+        self.assertIs(giveaway_bot.get_config(), previous)
+
+    def test_config_section(self):
+        section = giveaway_bot.ConfigSection({'steamLogin': '1', 'retry': '0'})
+        self.assertEqual(section['steamLogin'], '1')
+        self.assertEqual(section['STEAMLOGIN'], '1')
+        self.assertEqual(len(section), 2)
+        with self.assertRaises(TypeError):
+            section['retry'] = '1'
+
+        config = giveaway_bot.get_config()
+        with self.assertRaises(TypeError):
+            config['main'] = section
+
+
+class AsyncRunnerTestCase(unittest.TestCase):
+    def test_host_limit(self):
+        loop = asyncio.new_event_loop()
+        runner = giveaway_bot.AsyncRunner(loop, {'example.com': 2})
+        running = []
+        peak = []
+
+        def request(n):
+            running.append(n)
+            peak.append(len(running))
+            time.sleep(0.05)
+            running.remove(n)
+            return n
+
+        async def run_all():
+            return await asyncio.gather(*[runner.run('http://example.com/page/%s' % n, request, n) for n in range(6)])
+
+        try:
+            results = loop.run_until_complete(run_all())
+        finally:
+            runner.close()
+            loop.close()
+
+        self.assertEqual(results, list(range(6)))
+        self.assertEqual(max(peak), 2)
+
+
+class RateLimitTestCase(unittest.TestCase):
+    def test_token_bucket(self):
+        bucket = giveaway_bot.TokenBucket(rate=20, burst=2)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        # Two at once, next four by rate
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+    def test_session(self):
+        config = dict(giveaway_bot.get_config())
+        config['RateLimit'] = giveaway_bot.ConfigSection({'example.com': '20', 'default': '0', 'burst': '1'})
+        previous = giveaway_bot.get_config()
+        giveaway_bot.set_config(config)
+        self.addCleanup(giveaway_bot.set_config, previous)
+
+        self.assertIsNone(giveaway_bot.get_bucket('http://example.org/'))
+        bucket = giveaway_bot.get_bucket('http://example.com/page')
+        self.assertIs(giveaway_bot.get_bucket('http://example.com/other'), bucket)
+
+        class Adapter(giveaway_bot.requests.adapters.BaseAdapter):
+            def send(self, request, **kwargs):
+                response = giveaway_bot.requests.Response()
+                response.status_code = 200
+                response.request = request
+                response.url = request.url
+                return response
+
+            def close(self):
+                pass
+
+        session = giveaway_bot.RateLimitedSession()
+        session.mount('http://', Adapter())
+        start = time.monotonic()
+        for _ in range(3):
+            self.assertEqual(session.get('http://example.com/').status_code, 200)
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+
+class GiveawayBotTestCase(unittest.TestCase):
+    def test_collect(self):
+        bot = giveaway_bot.GiveawayBot(100)
+        pending = {'Test'}
+        channel = bot._open_channel('Test')
+        channel.put({'status': 'ok'})
+        self.assertEqual(bot.collect(pending, 5), [('Test', {'status': 'ok'})])
+        self.assertEqual(pending, set())
+        self.assertEqual(bot.collect(pending, 0), [])
+
+        process = multiprocessing.Process(target=time.sleep, args=(0, ))
+        process.start()
+        bot.executor = giveaway_bot.ProcessExecutor(bot)
+        bot.executor.workers['Test'] = {'process': process, 'commands': None}
+        pending = {'Test'}
+        with self.assertLogs('Bot', level='ERROR'):
+            results = bot.collect(pending, 5)
+        process.join()
+        self.assertEqual([(name, result['status']) for name, result in results], [('Test', 'error')])
+        self.assertEqual(pending, set())
+
+    def test_abort(self):
+        bot = giveaway_bot.GiveawayBot(100)
+        self.assertEqual(bot.harvest_timeout, int(bot.config['main']['sleepTime']) * 60)
+
+        process = multiprocessing.Process(target=time.sleep, args=(60, ))
+        process.start()
+        bot.executor = giveaway_bot.ProcessExecutor(bot)
+        bot.executor.workers['Test'] = {'process': process, 'commands': None}
+        pending = {'Test'}
+        with self.assertLogs('Bot', level='ERROR'):
+            results = bot.abort(pending)
+        process.join(5)
+        self.assertFalse(process.is_alive())
+        self.assertEqual([(name, result['msg']) for name, result in results], [('Test', 'Timed out')])
+        self.assertEqual(pending, set())
+        self.assertEqual(bot.executor.workers, {})
+
+    def test_executor_name(self):
+        self.assertEqual(giveaway_bot.executor_name({}), 'process')
+        self.assertEqual(giveaway_bot.executor_name({'executor': 'thread'}), 'thread')
+
+    def test_in_process_executors(self):
+        harvester = type('ExecutorHarvester', (giveaway_bot.Harvester, ), {
+            'name': 'Steam', 'level': 1, 'points': 30, '_get_giveaways': lambda hw, page: [], '_reap': lambda hw: [],
+            '_fetch_trust_points': lambda hw, profile_url: 0})
+        giveaway_bot.HARVESTERS['Steam'] = harvester
+        self.addCleanup(giveaway_bot.HARVESTERS.pop, 'Steam')
+
+        bot = giveaway_bot.GiveawayBot(100)
+        for executor in (giveaway_bot.SequentialExecutor, giveaway_bot.ThreadExecutor, giveaway_bot.AsyncExecutor):
+            bot.executor = executor(bot)
+            pending = set(bot.executor.submit(['Steam']))
+            results = bot.collect(pending, 5)
+            self.assertEqual([(name, result['status']) for name, result in results], [('Steam', 'ok')])
+            self.assertEqual(pending, set())
+
+
+class CacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'test.cache')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_get_set(self):
+        cache = giveaway_bot.Cache(self.path)
+        self.assertEqual(cache.get(1), {})
+
+        cache.set(1, {'os_list': ['win'], 'cards': True})
+        cache.close()
+
+        cache = giveaway_bot.Cache(self.path)
+        self.assertEqual(cache.get(1), {'os_list': ['win'], 'cards': True})
+        cache.close()
+
+    def test_ttl(self):
+        cache = giveaway_bot.Cache(self.path, ttl={'cards': 1})
+        cache.set(1, {'os_list': ['win'], 'cards': True})
+        time.sleep(1.1)
+        self.assertEqual(cache.get(1), {'os_list': ['win']})
+        cache.close()
+
+    def test_eviction(self):
+        cache = giveaway_bot.Cache(self.path, max_items=2)
+        cache.set(1, {'title': 'one'})
+        time.sleep(0.01)
+        cache.set(2, {'title': 'two'})
+        time.sleep(0.01)
+        cache.get(1)
+        time.sleep(0.01)
+        cache.set(3, {'title': 'three'})
+
+        self.assertEqual(cache.get(1), {'title': 'one'})
+        self.assertEqual(cache.get(2), {})
+        self.assertEqual(cache.get(3), {'title': 'three'})
+        cache.close()
+
+    def test_accessed_batch(self):
+        cache = giveaway_bot.Cache(self.path)
+        cache.flush_reads = 2
+        cache.set(1, {'title': 'one'})
+        cache.set(2, {'title': 'two'})
+
+        def accessed():
+            return dict(cache.db.execute('SELECT key, accessed FROM cache').fetchall())
+
+        # Reads don't write until enough of them
+        written = accessed()
+        cache.get(1)
+        self.assertEqual(accessed(), written)
+        cache.get(2)
+        self.assertEqual(cache.accessed, {})
+        self.assertGreater(accessed()['2'], written['2'])
+        cache.close()
 
 
 class SteamParserTestCase(unittest.TestCase):
@@ -87,12 +386,86 @@ class SteamParserTestCase(unittest.TestCase):
         steam = giveaway_bot.SteamParser(self.queue, self.log_level)
         self.assertEqual(id(self.steam), id(steam))
 
+    def test_prepare_steam(self):
+        steam = giveaway_bot.prepare_steam(self.queue, self.log_level)
+        steam.apps['1'] = {'title': 'Game'}
+        steam.cached_wishlist_ids = frozenset()
+        self.assertIs(giveaway_bot.prepare_steam(self.queue, self.log_level), steam)
+        self.assertEqual(steam.apps, {})
+        self.assertFalse(hasattr(steam, 'cached_wishlist_ids'))
+
+        # New Steam settings, new parser
+        previous = giveaway_bot.get_config()
+        self.addCleanup(giveaway_bot.prepare_steam, self.queue, self.log_level)
+        self.addCleanup(giveaway_bot.set_config, previous)
+        giveaway_bot.set_config(dict(previous, Steam=giveaway_bot.ConfigSection(dict(previous['Steam'], retry='1'))))
+        self.assertIsNot(giveaway_bot.prepare_steam(self.queue, self.log_level), steam)
+
+    def test_stop_after_crash(self):
+        steam = giveaway_bot.prepare_steam(self.queue, self.log_level)
+        requests = []
+
+        def _get_page(url, strainer=None, **kwargs):
+            requests.append(url)
+            raise giveaway_bot.AuthError
+
+        steam._get_page = _get_page
+        self.addCleanup(delattr, steam, '_get_page')
+        giveaway_bot.UNIT_TESTS = False
+        self.addCleanup(setattr, giveaway_bot, 'UNIT_TESTS', True)
+
+        # Failed Steam lists are not requested again for each giveaway
+        for _ in range(3):
+            with self.assertRaises(giveaway_bot.Error):
+                steam.wishlist_ids
+        self.assertEqual(len(requests), 1)
+        with self.assertRaises(giveaway_bot.Error):
+            steam.get_app_info(1)
+
+        giveaway_bot.prepare_steam(self.queue, self.log_level)
+        self.assertIsNone(steam.failure)
+
+    def test_steam_spawner(self):
+        self.addCleanup(setattr, giveaway_bot, 'DEDICATED_WORKER', False)
+        self.addCleanup(setattr, giveaway_bot, 'USER_AGENT', giveaway_bot.USER_AGENT)
+        previous = giveaway_bot.get_config()
+        self.addCleanup(giveaway_bot.set_config, previous)
+        config = dict(previous, main=giveaway_bot.ConfigSection(dict(previous['main'], USER_AGENT='Test agent')))
+
+        commands = Queue()
+        commands.put(('fetch', config, set()))
+        commands.put(('stop', ))
+        giveaway_bot.steam_spawner(commands, self.queue, self.log_level, config)
+
+        results = self.queue.get(timeout=5)
+        self.assertEqual((results['status'], results['steam']), ('ok', {}))
+        # Same setup as harvester workers
+        self.assertEqual(giveaway_bot.USER_AGENT, 'Test agent')
+
     def test_login_check(self):
         loged_html = '<a class="user_avatar"></a>'
         with self.assertLogs(self.steam.name, level='DEBUG') as log:
             self.steam._login_check(loged_html)
             self.assertIn('login successful', log.output[0])
 
+    def test_parse_app_page(self):
+        app_html = '<div class="apphub_AppName">Portal 2</div>' \
+                   '<span class="platform_img win"></span><span class="platform_img mac"></span>' \
+                   '<div id="category_block"><img class="category_icon" src="/ico_cards.png"></div>'
+        app_info = self.steam._parse_app_page(app_html)
+        self.assertEqual(app_info, {'os_list': ['win', 'mac'], 'type': 'game', 'cards': True, 'title': 'Portal 2'})
+
+        dlc_html = '<div class="game_area_dlc_bubble"></div><span class="platform_img linux"></span>'
+        dlc_info = self.steam._parse_app_page(dlc_html)
+        self.assertEqual(dlc_info, {'os_list': ['lin'], 'type': 'dlc', 'cards': False, 'title': None})
+
+    def test_get_app_info_cached(self):
+        self.steam.apps[-1] = {'os_list': ['win'], 'type': 'game', 'cards': False, 'title': 'Cached'}
+        self.assertEqual(self.steam.get_os_list(-1), ['win'])
+        self.assertEqual(self.steam.get_type(-1), 'game')
+        self.assertEqual(self.steam.get_cards(-1), False)
+        self.assertEqual(self.steam.get_title(-1), 'Cached')
+
     @unittest.skipIf(TRAVIS_BUILD, "Login required")
     def test_wishlist(self):
         wishlist = self.steam.wishlist
@@ -107,6 +480,45 @@ class SteamParserTestCase(unittest.TestCase):
         self.assertIn('title', random_item)
         self.assertIs(type(random_item['title']), str)
 
+    def test_parse_library(self):
+        page = '<html><script>\nvar rgGames = [{"appid":10,"name":"Counter-Strike","hours_forever":"1,5"},' \
+               '{"appid":440,"name":"Team Fortress 2 «Ünicode»","logo":"http:\\/\\/example.com\\/logo.jpg"}];\n' \
+               'var rgChangingGames = [];</script></html>'
+        page = page.encode()
+        expected = [{'appid': 10, 'name': 'Counter-Strike'}, {'appid': 440, 'name': 'Team Fortress 2 «Ünicode»'}]
+
+        for size in (1, 7, 64, len(page)):
+            chunks = [page[i:i + size] for i in range(0, len(page), size)]
+            self.assertEqual(self.steam._parse_library(chunks), expected)
+
+        with self.assertRaises(giveaway_bot.AuthError):
+            self.steam._parse_library([b'<html>Sign In</html>'])
+
+        with self.assertRaises(giveaway_bot.ParseError):
+            self.steam._parse_library([b'var rgGames = [{"appid":10,'])
+
+    def test_preload(self):
+        wishlist_ids = frozenset([10, 20])
+        self.steam.preload({'wishlist_ids': wishlist_ids})
+        try:
+            self.assertIs(self.steam.wishlist_ids, wishlist_ids)
+        finally:
+            del self.steam.cached_wishlist_ids
+
+    def test_apps_ids(self):
+        class SteamStub:
+            wishlist = [{'id': 10, 'title': 'Counter-Strike'}, {'id': 20, 'title': 'Team Fortress Classic'}]
+            library = [{'appid': 30, 'name': 'Day of Defeat'}]
+
+        steam = SteamStub()
+        for name in ('wishlist_apps', 'wishlist_ids', 'library_apps', 'library_ids'):
+            setattr(SteamStub, name, getattr(type(self.steam), name))
+
+        self.assertEqual(steam.wishlist_ids, frozenset([10, 20]))
+        self.assertEqual(steam.wishlist_apps[20]['title'], 'Team Fortress Classic')
+        self.assertEqual(steam.library_ids, frozenset([30]))
+        self.assertEqual(steam.library_apps[30]['name'], 'Day of Defeat')
+
     @unittest.skipIf(TRAVIS_BUILD, "Login required")
     def test_library(self):
         library = self.steam.library
@@ -168,8 +580,20 @@ class SteamParserTestCase(unittest.TestCase):
 class HarvesterTestCase(unittest.TestCase):
     def setUp(self):
         self.queue = multiprocessing.Queue()
+
+        def _get_giveaways(hw, page):
+            if page == 1:
+                return self.gw_list
+            else:
+                return []
+
+        self.TestHarvester = type('TestHarvester', (giveaway_bot.Harvester,), {'_get_giveaways': _get_giveaways, '_reap': '', '_fetch_trust_points': '', 'level': 1, 'points': 30})
+        self.TestHarvester.name = 'Steam'
+        self.hw = self.TestHarvester(self.queue, 100)
+        self.hw.filters = ['entered', 'level', 'library', 'wishlist', 'dlc', 'cards', ['trust', '0'],
+                           'trust', ['max_points', '50'], ['min_points', '10'], ['min_level', '1'], ['os', 'lin']]
+
         TestGiveaway = type('TestGiveaway', (giveaway_bot.Giveaway, ), {'enter': lambda s: 'ok'})
-        TestGiveaway.name = 'Steam'
 
         self.gw_list = []
 
@@ -191,63 +615,51 @@ class HarvesterTestCase(unittest.TestCase):
             for key in kwargs:
                 setattr(gw, key, kwargs[key])
 
-        self.gw_default = TestGiveaway(self.queue, 100, 0)
+        self.gw_default = TestGiveaway(self.hw, '', '', False, 0, 0, '')
         set_gw_attribs(self.gw_default)
 
-        self.gw_lib = TestGiveaway(self.queue, 100, 0)
+        self.gw_lib = TestGiveaway(self.hw, '', '', False, 0, 0, '')
         set_gw_attribs(self.gw_lib, cached_in_library=True, title='Game In Library')
 
-        self.gw_wish = TestGiveaway(self.queue, 100, 0)
+        self.gw_wish = TestGiveaway(self.hw, '', '', False, 0, 0, '')
         set_gw_attribs(self.gw_wish, cached_in_wishlist=False, title='Game Not In Wishlist')
 
-        self.gw_enter = TestGiveaway(self.queue, 100, 0)
+        self.gw_enter = TestGiveaway(self.hw, '', '', False, 0, 0, '')
         set_gw_attribs(self.gw_enter, entered=True, title='Already In Giveaway')
 
-        self.gw_height_level = TestGiveaway(self.queue, 100, 0)
+        self.gw_height_level = TestGiveaway(self.hw, '', '', False, 0, 0, '')
         set_gw_attribs(self.gw_height_level, level='5', title='To height level')
 
-        self.gw_low_level = TestGiveaway(self.queue, 100, 0)
+        self.gw_low_level = TestGiveaway(self.hw, '', '', False, 0, 0, '')
         set_gw_attribs(self.gw_low_level, level='0', title='To low level')
 
-        self.gw_expensive = TestGiveaway(self.queue, 100, 0)
+        self.gw_expensive = TestGiveaway(self.hw, '', '', False, 0, 0, '')
         set_gw_attribs(self.gw_expensive, points='100', title='To expensive')
 
-        self.gw_chip = TestGiveaway(self.queue, 100, 0)
+        self.gw_chip = TestGiveaway(self.hw, '', '', False, 0, 0, '')
         set_gw_attribs(self.gw_chip, points='5', title='To chip')
 
-        self.gw_trust_zero = TestGiveaway(self.queue, 100, 0)
+        self.gw_trust_zero = TestGiveaway(self.hw, '', '', False, 0, 0, '')
         set_gw_attribs(self.gw_trust_zero, trust_points='0', title='Zero trust')
 
-        self.gw_trust_negative = TestGiveaway(self.queue, 100, 0)
+        self.gw_trust_negative = TestGiveaway(self.hw, '', '', False, 0, 0, '')
         set_gw_attribs(self.gw_trust_negative, trust_points='-1', title='Negative trust')
 
-        self.gw_win = TestGiveaway(self.queue, 100, 0)
+        self.gw_win = TestGiveaway(self.hw, '', '', False, 0, 0, '')
         set_gw_attribs(self.gw_win, cached_os_list=['lin', 'mac'], title='Not support Windows')
 
-        self.gw_lin = TestGiveaway(self.queue, 100, 0)
+        self.gw_lin = TestGiveaway(self.hw, '', '', False, 0, 0, '')
         set_gw_attribs(self.gw_lin, cached_os_list=['win', 'mac'], title='Not support Linix')
 
-        self.gw_mac = TestGiveaway(self.queue, 100, 0)
+        self.gw_mac = TestGiveaway(self.hw, '', '', False, 0, 0, '')
         set_gw_attribs(self.gw_mac, cached_os_list=['win', 'lin'], title='Not support Mac')
 
-        self.gw_dlc = TestGiveaway(self.queue, 100, 0)
+        self.gw_dlc = TestGiveaway(self.hw, '', '', False, 0, 0, '')
         set_gw_attribs(self.gw_dlc, cached_dlc=True, title='This is TRAP!')
 
-        self.gw_cards = TestGiveaway(self.queue, 100, 0)
+        self.gw_cards = TestGiveaway(self.hw, '', '', False, 0, 0, '')
         set_gw_attribs(self.gw_cards, cached_cards=False, title='No cards')
 
-        def _get_giveaways(hw, page):
-            if page == 1:
-                return self.gw_list
-            else:
-                return []
-
-        self.TestHarvester = type('TestHarvester', (giveaway_bot.Harvester,), {'_get_giveaways': _get_giveaways, '_reap': '', 'level': 1, 'points': 30})
-        self.TestHarvester.name = 'Steam'
-        self.hw = self.TestHarvester(self.queue, 100)
-        self.hw.filters = ['entered', 'level', 'library', 'wishlist', 'dlc', 'cards', ['trust', '0'],
-                           'trust', ['max_points', '50'], ['min_points', '10'], ['min_level', '1'], ['os', 'lin']]
-
     def test_sow(self):
         giveaways_enter = self.hw._sow()
         self.assertIsInstance(giveaways_enter, list)
@@ -283,6 +695,244 @@ class HarvesterTestCase(unittest.TestCase):
         self.assertIn(self.gw_trust_zero, gw_list_trust_all)
         self.assertIn(self.gw_trust_negative, gw_list_trust_all)
 
+    def test_parse_filters(self):
+        config = {'filters': 'wishlist, trust=0, max_points=60'}
+        self.assertEqual(giveaway_bot.SteamGiftsHarvester.parse_filters(config),
+                         ['entered', 'level', 'wishlist', ['trust', '0'], ['max_points', '60']])
+        self.assertEqual(giveaway_bot.SteamGiftsHarvester.required_filters, ['entered', 'level', 'library'])
+
+    def test_steam_lists(self):
+        self.assertEqual(giveaway_bot.SteamGiftsHarvester.steam_lists({'filters': 'wishlist'}), set())
+        self.assertEqual(giveaway_bot.IndieGalaHarvester.steam_lists({'filters': 'library'}), set())
+        self.assertEqual(giveaway_bot.IndieGalaHarvester.steam_lists({'filters': 'wishlist'}), {'wishlist'})
+        self.assertEqual(self.TestHarvester.steam_lists({'filters': 'library'}), {'library'})
+
+    def test_prefetch_trust_points(self):
+        fetched = []
+
+        def fetch(profile_url):
+            fetched.append(profile_url)
+            return len(profile_url)
+
+        self.hw._fetch_trust_points = fetch
+        for gw in self.gw_list[:10]:
+            gw.profile_url = 'http://example.com/user/one'
+        for gw in self.gw_list[10:]:
+            gw.profile_url = 'http://example.com/user/two'
+
+        self.hw._prefetch_trust_points(self.gw_list)
+        self.assertEqual(sorted(fetched), ['http://example.com/user/one', 'http://example.com/user/two'])
+
+        self.assertEqual(self.hw._get_trust_points('http://example.com/user/one'), 27)
+        self.assertEqual(len(fetched), 2)
+
+    def test_sow_prefetch(self):
+        fetched = []
+
+        def get_giveaways(page):
+            fetched.append(page)
+            return list(self.gw_list)
+
+        self.hw._get_giveaways = get_giveaways
+        for prefetch in (0, 2):
+            del fetched[:]
+            self.hw.prefetch = prefetch
+            giveaways_enter = self.hw._sow()
+            self.assertEqual(len(giveaways_enter), 2)
+
+            # Points are over on first page, fetching stopped
+            time.sleep(0.3)
+            self.assertLessEqual(len(fetched), prefetch + 2)
+            self.assertEqual(fetched, list(range(1, len(fetched) + 1)))
+
+    def test_ordered_filters(self):
+        self.hw.filters = [['trust', '0'], 'cards', 'wishlist', ['max_points', '50'], 'entered', 'unknown']
+        self.assertEqual([key for key, fn, args in self.hw._ordered_filters()],
+                         ['max_points=50', 'entered', 'wishlist', 'trust=0', 'cards'])
+
+        # Most selective first in the same cost class
+        self.hw.filter_stats = {'max_points=50': [90, 100], 'entered': [10, 100]}
+        self.assertEqual([key for key, fn, args in self.hw._ordered_filters()][:2], ['entered', 'max_points=50'])
+
+    def test_apply_filters_stats(self):
+        checked = []
+
+        def fetch(profile_url):
+            checked.append(profile_url)
+            return 1
+
+        self.hw._fetch_trust_points = fetch
+        for n, gw in enumerate(self.gw_list):
+            gw.profile_url = 'http://example.com/user/%s' % n
+        self.hw.filters = ['trust', 'entered', ['max_points', '50']]
+
+        giveaways = self.hw._apply_filters(self.gw_list)
+        self.assertNotIn(self.gw_enter, giveaways)
+        self.assertNotIn(self.gw_expensive, giveaways)
+        # Authors requested only for giveaways passed local filters
+        self.assertEqual(len(checked), len(self.gw_list) - 2)
+        self.assertEqual(self.hw.filter_stats['entered'], [len(self.gw_list) - 1, len(self.gw_list)])
+
+    def test_scheduled_reap(self):
+        reaped = []
+
+        def reap():
+            reaped.append(1)
+            return [{'title': 'Won', 'href': 'http://example.com/'}]
+
+        self.hw._reap = reap
+        self.hw.reap_state = giveaway_bot.Cache(':memory:', table='reap')
+        self.hw._reap_fingerprint = lambda: 1
+
+        self.hw.reap_interval = 0
+        self.assertEqual(len(self.hw._scheduled_reap()), 1)
+        # Same fingerprint
+        self.assertEqual(len(self.hw._scheduled_reap()), 1)
+        self.assertEqual(len(reaped), 1)
+
+        self.hw._reap_fingerprint = lambda: 2
+        self.hw.reap_interval = 60
+        self.assertEqual(len(self.hw._scheduled_reap()), 1)
+        self.assertEqual(len(reaped), 1)
+
+        self.hw.reap_interval = 0
+        self.hw._scheduled_reap()
+        self.assertEqual(len(reaped), 2)
+
+        # Without cache state kept by harvester
+        self.hw.reap_state = None
+        self.assertEqual(len(self.hw._scheduled_reap()), 1)
+        self.assertEqual(len(reaped), 2)
+
+        # With empty harvester state cache used
+        self.hw.reap_state = giveaway_bot.Cache(':memory:', table='reap')
+        self.hw.reap_state.set(self.hw.name, dict(self.hw.last_reap, fingerprint=3))
+        self.hw.last_reap = {}
+        self.hw._reap_fingerprint = lambda: 3
+        self.hw._scheduled_reap()
+        self.assertEqual(len(reaped), 2)
+
+    def test_start(self):
+        self.hw._reap = lambda: []
+        self.hw.reap_state = None
+        self.hw.start()
+        results = self.queue.get(timeout=5)
+        self.assertEqual(results['status'], 'ok')
+        self.assertEqual(len(results['sow']), 2)
+
+    def test_start_reap_failed(self):
+        def reap():
+            time.sleep(0.1)
+            raise giveaway_bot.Error("Steam reap error. Interrupt reaping.")
+
+        self.hw._reap = reap
+        self.hw.reap_state = None
+        self.hw.start()
+        # Entered giveaways are sent, reap is tried again next harvest
+        results = self.queue.get(timeout=5)
+        self.assertEqual(results['status'], 'ok')
+        self.assertEqual(len(results['sow']), 2)
+        self.assertEqual(results['reap'], [])
+        self.assertEqual(self.hw.last_reap, {})
+        self.assertEqual(results['reap'], [])
+
+    def test_worker_spawner(self):
+        created = []
+
+        def factory(queue, log_level):
+            hw = self.TestHarvester(queue, log_level)
+            hw._get_giveaways = self.hw._get_giveaways
+            hw._reap = lambda: []
+            hw.reap_state = None
+            hw.cached_account = {}
+            hw.trust_cache['http://example.com/user'] = 1
+            created.append(hw)
+            return hw
+
+        giveaway_bot.HARVESTERS['Test'] = factory
+        self.addCleanup(giveaway_bot.HARVESTERS.pop, 'Test')
+        self.addCleanup(giveaway_bot._harvesters.pop, 'Test', None)
+        self.addCleanup(setattr, giveaway_bot, 'DEDICATED_WORKER', False)
+
+        config = dict(giveaway_bot.get_config())
+        changed = dict(config, Steam=giveaway_bot.ConfigSection(dict(config['Steam'], filters='entered')))
+        commands = Queue()
+        for command in [('harvest', config, {}), ('harvest', config, {}), ('harvest', changed, {}), ('stop', )]:
+            commands.put(command)
+
+        giveaway_bot.worker_spawner('Test', commands, self.queue, 100, config)
+        giveaway_bot.set_config(config)
+
+        for _ in range(3):
+            self.assertEqual(self.queue.get(timeout=5)['status'], 'ok')
+        # Harvester kept between harvests, account state is not
+        self.assertEqual(len(created), 2)
+        self.assertFalse(hasattr(created[0], 'cached_account'))
+        self.assertEqual(created[0].trust_cache, {})
+
+    def test_crash_in_shared_process(self):
+        def _prepare(hw):
+            raise giveaway_bot.ParseError
+
+        self.TestHarvester._prepare = giveaway_bot.retrying(_prepare)
+        self.TestHarvester.verbose_name = 'Test'
+        giveaway_bot.HARVESTERS['Test'] = self.TestHarvester
+        self.addCleanup(giveaway_bot.HARVESTERS.pop, 'Test')
+        giveaway_bot.UNIT_TESTS = False
+        self.addCleanup(setattr, giveaway_bot, 'UNIT_TESTS', True)
+
+        # Harvester is stopped with Error instead of exit of process and its error sent once
+        queue = Queue()
+        giveaway_bot.harvest({}, 'Test', queue, 100)
+        results = queue.get(timeout=5)
+        self.assertEqual((results['status'], results['msg']), ('error', 'Test parsing error. Interrupt parsing.'))
+        self.assertTrue(queue.empty())
+
+    def test_select(self):
+        TestGiveaway = type(self.gw_default)
+        expensive = TestGiveaway(self.hw, 'Expensive', '', False, 0, 6, '', entries=1)
+        first = TestGiveaway(self.hw, 'First', '', False, 0, 5, '', entries=0)
+        second = TestGiveaway(self.hw, 'Second', '', False, 0, 5, '', entries=0)
+        candidates = [expensive, first, second]
+
+        self.hw.score = ['entries']
+        self.assertEqual(self.hw._select(candidates, 10), [first, second])
+        self.assertEqual(self.hw._select(candidates, 7), [first])
+        self.assertEqual(self.hw._select(candidates, 4), [])
+
+        self.hw.selection_time = 0
+        self.assertEqual(self.hw._select(candidates, 10), [first, second])
+
+    def test_sow_knapsack(self):
+        self.hw.selection = 'knapsack'
+        giveaways_enter = self.hw._sow()
+        self.assertEqual(len(giveaways_enter), 2)
+
+    def test_iter_pages_error(self):
+        def get_giveaways(page):
+            if page == 2:
+                raise giveaway_bot.ParseError
+            return list(self.gw_list)
+
+        self.hw._get_giveaways = get_giveaways
+        pages = self.hw._iter_pages()
+        self.assertEqual(next(pages), self.gw_list)
+        with self.assertRaises(giveaway_bot.ParseError):
+            next(pages)
+
+    def test_async_sow(self):
+        loop = asyncio.new_event_loop()
+        runner = giveaway_bot.AsyncRunner(loop, {})
+        try:
+            giveaways_enter = loop.run_until_complete(self.hw._async_sow(runner))
+        finally:
+            runner.close()
+            loop.close()
+
+        self.assertEqual(len(giveaways_enter), 2)
+        for giveaway in giveaways_enter:
+            self.assertEqual(set(giveaway), {'title', 'href'})
+
     def test_arged_filter_max_points(self):
         gw_list = self.hw._arged_filter_max_points(self.gw_list, 50)
         self.assertIsInstance(gw_list, list)
@@ -357,11 +1007,16 @@ class HarvesterTestCase(unittest.TestCase):
 class GiveawayTestCase(unittest.TestCase):
     def setUp(self):
         queue = multiprocessing.Queue()
+        TestHarvester = type('TestHarvester', (giveaway_bot.Harvester,), {'_get_giveaways': '', '_reap': '', '_fetch_trust_points': '', 'level': 1, 'points': 30})
+        TestHarvester.name = 'Steam'
+        harvester = TestHarvester(queue, 100)
         TestGiveaway = type('TestGiveaway', (giveaway_bot.Giveaway, ), {'enter': ''})
-        TestGiveaway.name = 'Steam'
-        self.libed = TestGiveaway(queue, 100, 337420)
-        self.wished = TestGiveaway(queue, 100, 271590)
-        self.dlc = TestGiveaway(queue, 100, 235580)
+        self.libed = TestGiveaway(harvester, '', '', False, 0, 0, '')
+        self.libed.game_id = 337420
+        self.wished = TestGiveaway(harvester, '', '', False, 0, 0, '')
+        self.wished.game_id = 271590
+        self.dlc = TestGiveaway(harvester, '', '', False, 0, 0, '')
+        self.dlc.game_id = 235580
 
     @unittest.skipIf(TRAVIS_BUILD, "Login required")
     def test_in_wishlist(self):
@@ -431,6 +1086,69 @@ class SteamGiftsHarvesterTestCase(unittest.TestCase):
             self.harvester._login_check(loged_html)
             self.assertIn('login successful', log.output[0])
 
+    def test_parse_account(self):
+        html = '<div class="nav__avatar-inner-wrap"></div>' \
+               '<a><span class="nav__points">95</span><span> </span><span title="1.23">Level 1</span></a>' \
+               '<input name="xsrf_token" value="token">'
+        account = self.harvester._parse_account(html)
+        self.assertEqual(account, {'level': 1, 'points': 95, 'xsrf_token': 'token', 'won': 0})
+
+        won_html = html + '<a class="nav__button" href="/giveaways/won"><div class="nav__notification">2</div></a>'
+        self.assertEqual(self.harvester._parse_account(won_html)['won'], 2)
+
+        self.harvester.cached_account = account
+        self.assertEqual(self.harvester.level, 1)
+        self.assertEqual(self.harvester.points, 95)
+        self.assertEqual(self.harvester.xsrf_token, 'token')
+
+    def test_parse_settings(self):
+        html = '<div class="nav__avatar-inner-wrap"></div>' \
+               '<input type="hidden" name="xsrf_token" value="token">' \
+               '<input type="hidden" name="filter_os" value="0">' \
+               '<input type="hidden" name="filter_giveaways_level" value="1">'
+        settings = self.harvester._parse_settings(html)
+        self.assertEqual(settings, {'filter_os': '0', 'filter_giveaways_level': '1'})
+
+        self.harvester.filters = [['os', 'lin']]
+        self.assertEqual(self.harvester._internal_filters()['filter_os'], 2)
+
+    def test_parse_rows(self):
+        row = '<div class="giveaway__row-outer-wrap"><div class="giveaway__row-inner-wrap %(faded)s">' \
+              '<h2 class="giveaway__heading"><a class="giveaway__heading__name" href="/giveaway/%(code)s/game">' \
+              ' Game %(code)s </a><span class="giveaway__heading__thin">(%(points)sP)</span>' \
+              '<a class="giveaway__icon" target="_blank" href="http://store.steampowered.com/app/%(game_id)s/"></a>' \
+              '</h2><a class="giveaway__username" href="/user/%(user)s">%(user)s</a>%(level)s%(extra)s</div></div>'
+        extra = '<div class="giveaway__columns"><div><span data-timestamp="1500000000">1 hour</span> remaining</div>' \
+                '<div><span data-timestamp="1490000000">1 day</span> ago</div></div>' \
+                '<div class="giveaway__links"><a href="/giveaway/AbCdE/game/entries"><span>1,234 entries</span></a>' \
+                '<a href="/giveaway/AbCdE/game/comments"><span>12 comments</span></a></div>'
+        html = '<div class="nav__avatar-inner-wrap"></div>' \
+               '<div class="pinned-giveaways__outer-wrap">%s</div><div class="page__heading"></div><div>%s%s</div>' % (
+            row % {'faded': '', 'code': 'pinned', 'points': 1, 'game_id': 1, 'user': 'pinned', 'level': '', 'extra': ''},
+            row % {'faded': 'is-faded', 'code': 'AbCdE', 'points': 25, 'game_id': 440, 'user': 'one', 'extra': extra,
+                   'level': '<div class="giveaway__column--contributor-level" title="Contributor Level">Level 3+</div>'},
+            row % {'faded': '', 'code': 'FgHiJ', 'points': 5, 'game_id': 10, 'user': 'two', 'level': '', 'extra': ''})
+
+        expected = [{'game_id': 440, 'code': 'AbCdE', 'title': 'Game AbCdE', 'entered': True, 'level': 3, 'points': 25,
+                     'href': 'https://www.steamgifts.com/giveaway/AbCdE/game',
+                     'profile_url': 'https://www.steamgifts.com/user/one', 'entries': 1234, 'end_time': 1500000000},
+                    {'game_id': 10, 'code': 'FgHiJ', 'title': 'Game FgHiJ', 'entered': False, 'level': 0, 'points': 5,
+                     'href': 'https://www.steamgifts.com/giveaway/FgHiJ/game',
+                     'profile_url': 'https://www.steamgifts.com/user/two', 'entries': None, 'end_time': None}]
+
+        soup = giveaway_bot.bs4.BeautifulSoup(html, giveaway_bot.PARSER, parse_only=self.harvester.rows_strainer)
+        with self.assertLogs(self.harvester.name, level='DEBUG') as log:
+            self.harvester._login_check(soup)
+            self.assertIn('login successful', log.output[0])
+        self.assertEqual(self.harvester._parse_rows_soup(soup), expected)
+
+        if giveaway_bot.PARSER == "lxml":
+            tree = giveaway_bot.lxml.html.document_fromstring(html)
+            with self.assertLogs(self.harvester.name, level='DEBUG') as log:
+                self.harvester._login_check(tree)
+                self.assertIn('login successful', log.output[0])
+            self.assertEqual(self.harvester._parse_rows_lxml(tree), expected)
+
     @unittest.skipIf(TRAVIS_BUILD, "Login required")
     def test_level(self):
         level = self.harvester.level
@@ -457,7 +1175,13 @@ class SteamGiftsGiveawayTestCase(unittest.TestCase):
     def setUp(self):
         queue = multiprocessing.Queue()
         log_level = 100
-        self.giveaway = giveaway_bot.SteamGiftsGiveaway(queue, log_level, 0,  0, 0, 'Test SteamGifts Giveaway', '', False, 1, 1, 'https://www.steamgifts.com/user/Atterratio')
+        self.harvester = giveaway_bot.SteamGiftsHarvester(queue, log_level)
+        self.giveaway = giveaway_bot.SteamGiftsGiveaway(self.harvester, 0, 0, 'Test SteamGifts Giveaway', '', False, 1, 1, 'https://www.steamgifts.com/user/Atterratio')
+
+    def test_record(self):
+        self.assertFalse(hasattr(self.giveaway, '__dict__'))
+        self.assertIs(self.giveaway.harvester, self.harvester)
+        self.assertEqual(self.harvester.session.get_adapter(self.harvester.site_url)._pool_maxsize, 10)
 
     def test_trust_points(self):
         trust_points = self.giveaway.trust_points
@@ -477,6 +1201,85 @@ class IndieGalaHarvesterTestCase(unittest.TestCase):
             self.harvester._login_check(loged_html)
             self.assertIn('login successful', log.output[0])
 
+    def test_reap(self):
+        def completed(entry_ids):
+            to_check = ''.join('<li><input name="entry_id" value="%s"></li>' % entry_id for entry_id in entry_ids)
+            won = '<li><button class="btn-open-leave-feedback-form"></button>' \
+                  '<a title="View giveaway details" href="/detail/5"> Won Game </a></li><li>Lost</li>'
+            html = '<ul class="giveaways-completed-list-to-check">%s</ul><ul class="giveaways-completed-list"></ul>' \
+                   '<ul class="giveaways-completed-list">%s</ul>' % (to_check or '<li>No results.</li>', won)
+            return giveaway_bot.bs4.BeautifulSoup(html, giveaway_bot.PARSER)
+
+        pages = [completed(['1', '2', '3']), completed(['3']), completed(['3']), completed([])]
+        checked = []
+        self.harvester.config = dict(self.harvester.config, reap_poll='0')
+        self.harvester._get_completed = lambda url: pages.pop(0)
+        self.harvester._check_if_won = checked.append
+
+        self.assertEqual(self.harvester._reap(),
+                         [{'title': 'Won Game', 'href': 'https://www.indiegala.com/giveaways/detail/5'}])
+        self.assertEqual(sorted(checked), ['1', '2', '3', '3', '3'])
+        self.assertEqual(pages, [])
+
+    def test_async_prefetch_hosts(self):
+        class Runner:
+            hosts = set()
+
+            async def run(self, url, fn, *args):
+                self.hosts.add(giveaway_bot.urllib.parse.urlsplit(url).hostname if url else None)
+                return 1
+
+        giveaway = giveaway_bot.IndieGalaGiveaway(self.harvester, '1', 'Game',
+                                                  'https://www.indiegala.com/giveaways/detail/1', False, 0, 1, '')
+        self.harvester.filters = ['wishlist', 'level']
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self.harvester._async_prefetch(Runner(), [giveaway]))
+            self.assertEqual(Runner.hosts, {'www.indiegala.com', 'steamcommunity.com'})
+
+            Runner.hosts.clear()
+            loop.run_until_complete(self.harvester._async_prefetch_cached(Runner()))
+            self.assertEqual(Runner.hosts, {'www.indiegala.com'})
+
+            Runner.hosts.clear()
+            self.harvester.score = ['wishlist']
+            loop.run_until_complete(self.harvester._async_prefetch_score(Runner(), [giveaway]))
+            self.assertEqual(Runner.hosts, {'www.indiegala.com', 'steamcommunity.com'})
+        finally:
+            loop.close()
+
+    def test_parse_rows(self):
+        row = '<div class="tickets-col"><div class="box_pad_5"><h2><a title="Game %(id)s" ' \
+              'href="/giveaways/detail/%(id)s">Game %(id)s</a></h2></div>' \
+              '<div class="ticket-right"><div rel="%(id)s"></div></div>%(coupon)s' \
+              '<div class="type-level-cont"> Level %(level)s %(guaranteed)s</div>' \
+              '<div class="ticket-price"><strong> %(points)s </strong></div>' \
+              '<div class="steamnick"><a href="/profile/%(id)s">user</a></div></div>'
+        html = '<span class="account-email"></span><div class="tickets-row">%s%s</div>' % (
+            row % {'id': 1, 'coupon': '<aside class="giv-coupon"></aside>', 'level': 0, 'guaranteed': '',
+                   'points': 5},
+            row % {'id': 2, 'coupon': '', 'level': 2, 'guaranteed': 'not guaranteed', 'points': 30})
+
+        expected = [{'giveaway_id': '1', 'title': 'Game 1', 'href': 'https://www.indiegala.com/giveaways/detail/1',
+                     'entered': False, 'level': 0, 'points': 5, 'profile_url': 'https://www.indiegala.com/profile/1',
+                     'guaranteed': True},
+                    {'giveaway_id': '2', 'title': 'Game 2', 'href': 'https://www.indiegala.com/giveaways/detail/2',
+                     'entered': True, 'level': 2, 'points': 30, 'profile_url': 'https://www.indiegala.com/profile/2',
+                     'guaranteed': False}]
+
+        soup = giveaway_bot.bs4.BeautifulSoup(html, giveaway_bot.PARSER, parse_only=self.harvester.rows_strainer)
+        with self.assertLogs(self.harvester.name, level='DEBUG') as log:
+            self.harvester._login_check(soup)
+            self.assertIn('login successful', log.output[0])
+        self.assertEqual(self.harvester._parse_rows_soup(soup), expected)
+
+        if giveaway_bot.PARSER == "lxml":
+            tree = giveaway_bot.lxml.html.document_fromstring(html)
+            with self.assertLogs(self.harvester.name, level='DEBUG') as log:
+                self.harvester._login_check(tree)
+                self.assertIn('login successful', log.output[0])
+            self.assertEqual(self.harvester._parse_rows_lxml(tree), expected)
+
     @unittest.skipIf(TRAVIS_BUILD, "Login required")
     def test_level(self):
         level = self.harvester.level
@@ -503,7 +1306,8 @@ class IndieGalaGiveawayTestCase(unittest.TestCase):
     def setUp(self):
         queue = multiprocessing.Queue()
         log_level = 100
-        self.giveaway = giveaway_bot.IndieGalaGiveaway(queue, log_level, 173421, 'Polarity', 'https://www.indiegala.com/giveaways/detail/173421', False, 0, 1, 'https://www.indiegala.com/trades/user/f6f6f4abaff711e591621788afad681a')
+        harvester = giveaway_bot.IndieGalaHarvester(queue, log_level)
+        self.giveaway = giveaway_bot.IndieGalaGiveaway(harvester, 173421, 'Polarity', 'https://www.indiegala.com/giveaways/detail/173421', False, 0, 1, 'https://www.indiegala.com/trades/user/f6f6f4abaff711e591621788afad681a')
 
     @unittest.skipIf(TRAVIS_BUILD, "Incapsula bypass required")
     def test_trust_points(self):